@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+# Offline benchmark for bot.py.
+#
+# Starts local stand-ins for everything the bot talks to -- a CometBFT RPC
+# (HTTP, JSON-RPC batch and /websocket), story-geth (geth.ipc or HTTP), the
+# Telegram Bot API, and the systemctl/journalctl binaries -- then drives menu clicks from many chats and
+# monitoring rounds for many subscribers through the real handlers. Reports
+# throughput, latency percentiles and event-loop blocking.
+#
+#   python3 benchmark.py --chats 100 --fleet 50 --rpc-latency 20
+#
+# Nothing leaves the machine: the bot is pointed at 127.0.0.1 only.
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+
+FAKE_SYSTEMCTL = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+time.sleep(float(os.environ.get("FAKE_EXEC_DELAY", "0")))
+if args and args[0] == "show":
+    units = [a for a in args[1:] if not a.startswith("-")]
+    entered = int((time.monotonic() - 3600) * 1e6)
+    blocks = []
+    for unit in units:
+        blocks.append("\\n".join([
+            f"Id={{unit}}.service", "ActiveState=active", "SubState=running",
+            f"MainPID={{os.environ.get('FAKE_MAIN_PID', '0')}}", "NRestarts=0",
+            f"ActiveEnterTimestampMonotonic={{entered}}",
+        ]))
+    print("\\n\\n".join(blocks))
+"""
+
+FAKE_JOURNALCTL = """#!{python}
+import json, os, sys, time
+args = sys.argv[1:]
+interval = float(os.environ.get("FAKE_JOURNAL_INTERVAL", "0.05"))
+unit = args[args.index("-u") + 1] if "-u" in args else "unit"
+count = int(args[args.index("-n") + 1]) if "-n" in args else 100
+levels = [(6, "INFO executed block"), (4, "WARN peer timeout"), (3, "ERROR failed to dial peer"), (7, "DEBUG gossip")]
+seq = 0
+
+def entry():
+    global seq
+    seq += 1
+    priority, text = levels[seq % len(levels)]
+    now = int(time.time() * 1e6)
+    return {{"__CURSOR": f"s={{unit}};i={{seq}}", "__REALTIME_TIMESTAMP": str(now), "PRIORITY": str(priority),
+            "MESSAGE": f"{{text}} height={{seq}} module=consensus"}}
+
+if "json" in args:
+    for _ in range(count):
+        print(json.dumps(entry()))
+    sys.stdout.flush()
+    while "-f" in args:
+        time.sleep(interval)
+        print(json.dumps(entry()), flush=True)
+else:
+    for _ in range(count):
+        e = entry()
+        print(f"Jan 01 00:00:00 host {{unit}}[1]: {{e['MESSAGE']}}")
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(values) -> dict:
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": max(values, default=0.0) * 1000,
+    }
+
+
+class FakeChain:
+    # Shared chain state behind every fake node: a height that advances every
+    # block_time, a validator set that changes every valset_every blocks, and
+    # a commit per height where our validator misses with miss_rate.
+    def __init__(self, validators: int, block_time: float, valset_every: int, miss_rate: float):
+        self.height = 1_000_000
+        self.block_time = block_time
+        self.valset_every = valset_every
+        self.miss_rate = miss_rate
+        self.validators = [
+            {"address": f"{i:040X}", "voting_power": str(10_000_000 - i * 1000),
+             "proposer_priority": "0", "pub_key": {"type": "tendermint/PubKeyEd25519", "value": ""}}
+            for i in range(validators)
+        ]
+        self.our = self.validators[min(5, validators - 1)]
+        self.subscribers = set()
+
+    def validators_hash(self, height: int) -> str:
+        epoch = height // self.valset_every
+        return hashlib.sha256(str(epoch).encode()).hexdigest().upper()
+
+    def missed(self, height: int) -> bool:
+        return random.Random(height).random() < self.miss_rate
+
+    def header(self, height: int) -> dict:
+        return {
+            "height": str(height),
+            "time": datetime.now(timezone.utc).isoformat(),
+            "chain_id": "bench-1",
+            "validators_hash": self.validators_hash(height),
+        }
+
+    def commit(self, height: int) -> dict:
+        signatures = []
+        for v in self.validators:
+            absent = v is self.our and self.missed(height)
+            signatures.append({
+                "block_id_flag": 1 if absent else 2,
+                "validator_address": "" if absent else v["address"],
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "signature": None if absent else "c2ln",
+            })
+        return {"signed_header": {"header": self.header(height), "commit": {"height": str(height), "signatures": signatures}},
+                "canonical": True}
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.block_time)
+            self.height += 1
+            for queue in list(self.subscribers):
+                queue.put_nowait(self.height)
+
+
+class FakeCometRPC:
+    def __init__(self, chain: FakeChain, latency_ms: float, error_rate: float, peers: int):
+        self.chain = chain
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.peers = peers
+        self.requests = 0
+        self.app = web.Application(middlewares=[self.middleware])
+        for prefix in ("", "/{node}"):
+            self.app.router.add_get(f"{prefix}/status", self.status)
+            self.app.router.add_get(f"{prefix}/net_info", self.net_info)
+            self.app.router.add_get(f"{prefix}/validators", self.validators)
+            self.app.router.add_get(f"{prefix}/commit", self.commit)
+        self.app.router.add_get("/websocket", self.websocket)
+        self.app.router.add_post("/", self.jsonrpc)
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        self.requests += 1
+        if request.path != "/websocket":
+            if self.latency:
+                await asyncio.sleep(random.expovariate(1 / self.latency))
+            if random.random() < self.error_rate:
+                raise web.HTTPInternalServerError(text="injected error")
+        return await handler(request)
+
+    def node_height(self, node: str) -> int:
+        # Fleet nodes lag the chain by a stable, per-node amount.
+        if not node or node == "ref":
+            return self.chain.height
+        return self.chain.height - random.Random(node).choice([0, 0, 0, 1, 2, 5, 40])
+
+    async def status(self, request):
+        node = request.match_info.get("node", "")
+        height = self.node_height(node)
+        return web.json_response({"jsonrpc": "2.0", "id": -1, "result": {
+            "node_info": {"id": hashlib.sha1(node.encode()).hexdigest(), "listen_addr": "tcp://0.0.0.0:26656",
+                          "network": "bench-1", "version": "0.38.12", "moniker": node or "local"},
+            "sync_info": {"latest_block_height": str(height), "latest_block_time": datetime.now(timezone.utc).isoformat(),
+                          "catching_up": height < self.chain.height - 20},
+            "validator_info": {"address": self.chain.our["address"], "voting_power": self.chain.our["voting_power"],
+                               "proposer_priority": "0"},
+        }})
+
+    async def net_info(self, request):
+        peers = [
+            {"node_info": {"id": f"{i:040x}", "moniker": f"peer-{i}", "version": "0.38.12"},
+             "is_outbound": i % 2 == 0, "remote_ip": f"10.0.{i // 250}.{i % 250 + 1}",
+             "connection_status": {"Duration": str(i * 10**9),
+                                   "SendMonitor": {"AvgRate": str(1000 + i)}, "RecvMonitor": {"AvgRate": str(2000 + i)}}}
+            for i in range(self.peers)
+        ]
+        return web.json_response({"jsonrpc": "2.0", "id": -1, "result": {
+            "listening": True, "n_peers": str(self.peers), "peers": peers}})
+
+    async def validators(self, request):
+        page = int(request.query.get("page", 1))
+        per_page = int(request.query.get("per_page", 30))
+        pages = max(1, -(-len(self.chain.validators) // per_page))
+        if not 1 <= page <= pages:
+            # CometBFT rejects out-of-range pages rather than returning an empty one.
+            return web.json_response({"jsonrpc": "2.0", "id": -1, "error": {
+                "code": -32603, "message": "Internal error",
+                "data": f"page should be within [1, {pages}] range, given {page}"}}, status=500)
+        items = self.chain.validators[(page - 1) * per_page:page * per_page]
+        return web.json_response({"jsonrpc": "2.0", "id": -1, "result": {
+            "block_height": request.query.get("height", str(self.chain.height)),
+            "validators": items, "count": str(len(items)), "total": str(len(self.chain.validators))}})
+
+    async def commit(self, request):
+        height = int(request.query.get("height", self.chain.height))
+        return web.json_response({"jsonrpc": "2.0", "id": -1, "result": self.chain.commit(height)})
+
+    async def jsonrpc(self, request):
+        payload = await request.json()
+
+        def answer(call):
+            params = call.get("params") or {}
+            if call.get("method") == "commit":
+                height = int(params.get("height") or self.chain.height)
+                if height > self.chain.height:
+                    return {"jsonrpc": "2.0", "id": call.get("id"), "error": {"code": -32603, "message": "height too high"}}
+                return {"jsonrpc": "2.0", "id": call.get("id"), "result": self.chain.commit(height)}
+            return {"jsonrpc": "2.0", "id": call.get("id"), "error": {"code": -32601, "message": "method not found"}}
+
+        return web.json_response([answer(c) for c in payload] if isinstance(payload, list) else answer(payload))
+
+    async def websocket(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        queue = asyncio.Queue()
+        self.chain.subscribers.add(queue)
+
+        async def pump():
+            while True:
+                height = await queue.get()
+                await ws.send_json({"jsonrpc": "2.0", "id": 1, "result": {
+                    "query": "tm.event='NewBlockHeader'",
+                    "data": {"type": "tendermint/event/NewBlockHeader", "value": {"header": self.chain.header(height)}}}})
+
+        pusher = None
+        try:
+            async for msg in ws:
+                call = json.loads(msg.data)
+                await ws.send_json({"jsonrpc": "2.0", "id": call.get("id"), "result": {}})
+                if pusher is None:
+                    pusher = asyncio.create_task(pump())
+        finally:
+            self.chain.subscribers.discard(queue)
+            if pusher is not None:
+                pusher.cancel()
+        return ws
+
+
+class FakeGeth:
+    # Execution layer a fixed number of blocks behind the fake chain, answering
+    # JSON-RPC batches over HTTP and over a newline-delimited unix socket like geth.ipc.
+    OFFSET = 7
+
+    def __init__(self, chain: FakeChain):
+        self.chain = chain
+        self.requests = 0
+        self.app = web.Application()
+        self.app.router.add_post("/", self.http)
+
+    def answer(self, call: dict) -> dict:
+        results = {
+            "eth_blockNumber": hex(self.chain.height - self.OFFSET),
+            "eth_syncing": False,
+            "net_peerCount": hex(25),
+            "txpool_status": {"pending": hex(random.randint(0, 200)), "queued": hex(random.randint(0, 20))},
+            "eth_gasPrice": hex(1_500_000_000),
+        }
+        if call.get("method") not in results:
+            return {"jsonrpc": "2.0", "id": call.get("id"), "error": {"code": -32601, "message": "method not found"}}
+        return {"jsonrpc": "2.0", "id": call.get("id"), "result": results[call["method"]]}
+
+    def handle(self, payload):
+        self.requests += 1
+        return [self.answer(c) for c in payload] if isinstance(payload, list) else self.answer(payload)
+
+    async def http(self, request):
+        return web.json_response(self.handle(await request.json()))
+
+    async def ipc(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                writer.write(json.dumps(self.handle(json.loads(line))).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+class FakeTelegram:
+    # Answers the Bot API methods the bot uses with minimal valid objects and
+    # counts what it was sent.
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = {}
+        self.sent_chats = []
+        self.message_id = 0
+        self.app = web.Application()
+        self.app.router.add_post("/bot{token}/{method}", self.handle)
+
+    async def handle(self, request):
+        method = request.match_info["method"]
+        if request.content_type == "application/json":
+            params = await request.json()
+        else:
+            params = dict(await request.post())
+        self.calls[method] = self.calls.get(method, 0) + 1
+        if self.latency:
+            await asyncio.sleep(random.expovariate(1 / self.latency))
+
+        if method == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "bench", "username": "bench_bot",
+                      "can_join_groups": True, "can_read_all_group_messages": False, "supports_inline_queries": False}
+        elif method in ("sendMessage", "editMessageText", "sendDocument"):
+            self.message_id += 1
+            chat_id = int(params.get("chat_id") or 0)
+            if method != "editMessageText":
+                self.sent_chats.append(chat_id)
+            result = {"message_id": int(params.get("message_id") or self.message_id), "date": int(time.time()),
+                      "chat": {"id": chat_id, "type": "private"}, "text": str(params.get("text") or "")}
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+
+class LoopMonitor:
+    # Schedules a short sleep over and over and records how late each wake-up
+    # is; anything well past the interval means something blocked the loop.
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.lags = []
+        self.task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - started - self.interval))
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self._run())
+
+    def stop(self) -> dict:
+        self.task.cancel()
+        blocked = [lag for lag in self.lags if lag > 0.01]
+        return {
+            **summarize(self.lags),
+            "blocked_ms": sum(blocked) * 1000,
+            "blocked_events": len(blocked),
+        }
+
+
+class FakeServers:
+    # The fakes run on their own event loop in a separate thread, so the time
+    # they spend building responses does not show up as bot loop blocking.
+    def __init__(self, chain: FakeChain, apps: list, sockets: list = ()):
+        self.chain = chain
+        self.apps = apps
+        self.sockets = sockets
+        self.unix_servers = []
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.runners = []
+
+    async def _start(self) -> None:
+        for app, ports in self.apps:
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            for port in ([ports] if isinstance(ports, int) else ports):
+                await web.TCPSite(runner, "127.0.0.1", port).start()
+            self.runners.append(runner)
+        for handler, path in self.sockets:
+            self.unix_servers.append(await asyncio.start_unix_server(handler, path))
+        self.chain_task = asyncio.create_task(self.chain.run())
+
+    async def _stop(self) -> None:
+        self.chain_task.cancel()
+        for server in self.unix_servers:
+            server.close()
+        for runner in self.runners:
+            await runner.cleanup()
+
+    def start(self) -> None:
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def write_executable(directory: str, name: str, source: str) -> None:
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(source.format(python=sys.executable))
+    os.chmod(path, 0o755)
+
+
+CLICKS = [
+    "status", "validator", "fleet", "system_info", "performance", "network", "peers",
+    "logs_story", "log_filter_story_ERROR", "monitor_status", "start",
+]
+
+
+def callback_update(update_id: int, chat_id: int, user_id: int, data: str) -> dict:
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": {"id": user_id, "is_bot": False, "first_name": "bench"},
+            "chat_instance": str(chat_id),
+            "data": data,
+            "message": {"message_id": 1, "date": int(time.time()), "chat": {"id": chat_id, "type": "private"},
+                        "text": "menu"},
+        },
+    }
+
+
+async def run_clicks(bot, application, chats: int, clicks: int) -> dict:
+    # Clicks go through application.update_queue, so they are dispatched by the
+    # same update processor as in production, with its CONCURRENT_UPDATES
+    # limit. A handler in a later group marks each
+    # update as done once the bot's own handlers have finished with it.
+    from telegram import Update
+    from telegram.ext import TypeHandler
+
+    latencies = {}
+    counter = iter(range(1, 10**9))
+    pending = {}
+
+    async def done(update, context) -> None:
+        waiter = pending.pop(update.update_id, None)
+        if waiter is not None:
+            waiter.set_result(None)
+
+    application.add_handler(TypeHandler(Update, done), group=99)
+
+    async def chat(chat_id: int) -> None:
+        for i in range(clicks):
+            data = CLICKS[(chat_id + i) % len(CLICKS)]
+            update = Update.de_json(callback_update(next(counter), chat_id, bot.ADMIN_ID, data), application.bot)
+            waiter = pending[update.update_id] = asyncio.get_running_loop().create_future()
+            started = time.perf_counter()
+            await application.update_queue.put(update)
+            await waiter
+            latencies.setdefault(data, []).append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(chat(10_000 + c) for c in range(chats)))
+    elapsed = time.perf_counter() - started
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "clicks": total,
+        "elapsed_s": elapsed,
+        "clicks_per_s": total / elapsed if elapsed else 0.0,
+        "all": summarize([x for v in latencies.values() for x in v]),
+        "by_callback": {data: summarize(values) for data, values in sorted(latencies.items())},
+    }
+
+
+async def run_monitoring(bot, telegram: FakeTelegram, chats: int, rounds: int, timeout: float) -> dict:
+    hub = bot.monitoring_hub
+    chat_ids = [20_000 + c for c in range(chats)]
+    for chat_id in chat_ids:
+        hub.subscribe(chat_id, interval=3600)
+
+    round_times = []
+    for _ in range(rounds):
+        expected = set(chat_ids)
+        mark = len(telegram.sent_chats)
+        now = time.monotonic()
+        for chat_id in chat_ids:
+            hub.subscribers[chat_id]["next_due"] = now
+        hub._wakeup.set()
+        started = time.perf_counter()
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            if expected.issubset(telegram.sent_chats[mark:]):
+                break
+            await asyncio.sleep(0.01)
+        round_times.append(time.perf_counter() - started)
+
+    for chat_id in chat_ids:
+        hub.unsubscribe(chat_id)
+    return {
+        "subscribers": chats,
+        "rounds": rounds,
+        "round": summarize(round_times),
+        "reports_per_s": chats * rounds / sum(round_times) if sum(round_times) else 0.0,
+    }
+
+
+def print_table(title: str, rows: dict) -> None:
+    print(f"\n{title}")
+    width = max(28, *(len(name) for name in rows))
+    print(f"  {'':{width}} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name, s in rows.items():
+        print(f"  {name:{width}} {s['count']:>6} {s['p50_ms']:>7.1f}ms {s['p95_ms']:>7.1f}ms "
+              f"{s['p99_ms']:>7.1f}ms {s['max_ms']:>7.1f}ms")
+
+
+async def main(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="story-bot-bench-")
+    bindir = os.path.join(workdir, "bin")
+    os.makedirs(bindir)
+    write_executable(bindir, "systemctl", FAKE_SYSTEMCTL)
+    write_executable(bindir, "journalctl", FAKE_JOURNALCTL)
+
+    rpc_port, telegram_port, geth_port = free_port(), free_port(), free_port()
+    # Each fleet node gets its own port, as real nodes are separate hosts and
+    # the bot's per-host connection limit applies to each of them.
+    fleet_ports = [free_port() for _ in range(args.fleet)]
+    geth_ipc = os.path.join(workdir, "geth.ipc")
+    fleet_path = os.path.join(workdir, "fleet.json")
+    with open(fleet_path, "w") as f:
+        json.dump([{"label": f"node-{i}", "rpc": f"http://127.0.0.1:{port}/node{i}"} for i, port in enumerate(fleet_ports)], f)
+
+    # bot.py reads its configuration at import time.
+    os.environ.update({
+        "PATH": f"{bindir}{os.pathsep}{os.environ.get('PATH', '')}",
+        "FAKE_EXEC_DELAY": str(args.exec_delay / 1000),
+        "FAKE_MAIN_PID": str(os.getpid()),
+        "BOT_TOKEN": "123456:BENCH",
+        "ADMIN_ID": "4242",
+        "SERVER_PORT": str(rpc_port),
+        "RPC_ENDPOINT_1": f"http://127.0.0.1:{rpc_port}/ref/status",
+        "RPC_ENDPOINT_2": "",
+        "STORY_SERVICE": "story",
+        "STORY_GETH_SERVICE": "story-geth",
+        "STATE_DIR": os.path.join(workdir, "state"),
+        "GETH_IPC_PATH": geth_ipc if args.geth == "ipc" else "",
+        "GETH_RPC_URL": f"http://127.0.0.1:{geth_port}",
+        "FLEET_CONFIG": fleet_path if args.fleet else "",
+        "MONITOR_MODE": args.mode,
+        "TELEGRAM_GLOBAL_RATE": str(args.telegram_rate),
+        "TELEGRAM_CHAT_INTERVAL": "0",
+        "METRICS_SAMPLE_INTERVAL": "1",
+    })
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import bot
+    bot.logger.setLevel(args.log_level)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Requests cut off when the bot shuts down are expected, not errors.
+    logging.getLogger("aiohttp.server").setLevel(logging.CRITICAL)
+
+    chain = FakeChain(args.validators, args.block_time, args.valset_every, args.miss_rate)
+    rpc = FakeCometRPC(chain, args.rpc_latency, args.rpc_errors, args.peers)
+    telegram = FakeTelegram(args.telegram_latency)
+    geth = FakeGeth(chain)
+    servers = FakeServers(chain, [(rpc.app, [rpc_port, *fleet_ports]), (telegram.app, telegram_port), (geth.app, geth_port)],
+                          [(geth.ipc, geth_ipc)] if args.geth == "ipc" else [])
+    servers.start()
+
+    application = bot.build_application(base_url=f"http://127.0.0.1:{telegram_port}/bot")
+    await application.initialize()
+    await bot.post_init(application)
+    await application.start()
+    await asyncio.sleep(args.warmup)
+
+    monitor = LoopMonitor()
+    monitor.start()
+    results = {"config": vars(args)}
+    try:
+        results["clicks"] = await run_clicks(bot, application, args.chats, args.clicks)
+        results["monitoring"] = await run_monitoring(bot, telegram, args.chats, args.rounds, args.timeout)
+    finally:
+        results["event_loop"] = monitor.stop()
+        results["rpc_requests"] = rpc.requests
+        results["geth_requests"] = geth.requests
+        results["telegram_calls"] = dict(sorted(telegram.calls.items()))
+        results["operations"] = {name: summarize(list(op["samples"])) for name, op in sorted(bot.latency.ops.items())}
+        await application.stop()
+        await bot.post_shutdown(application)
+        await application.shutdown()
+        servers.stop()
+    return results
+
+
+def report(results: dict) -> None:
+    clicks, monitoring, loop = results["clicks"], results["monitoring"], results["event_loop"]
+    print(f"Clicks: {clicks['clicks']} in {clicks['elapsed_s']:.2f}s ({clicks['clicks_per_s']:.1f}/s)")
+    print_table("Click latency by callback:", {**clicks["by_callback"], "ALL": clicks["all"]})
+    print(f"\nMonitoring: {monitoring['subscribers']} chats x {monitoring['rounds']} rounds, "
+          f"{monitoring['reports_per_s']:.1f} reports/s")
+    print_table("Monitoring round (due -> every chat delivered):", {"round": monitoring["round"]})
+    print_table("Bot operations (from the bot's own latency registry):", results["operations"])
+    print(f"\nEvent loop: p99 lag {loop['p99_ms']:.1f}ms, max {loop['max_ms']:.1f}ms, "
+          f"blocked {loop['blocked_ms']:.0f}ms over {loop['blocked_events']} stalls >10ms")
+    print(f"RPC requests served: {results['rpc_requests']} (story-geth: {results['geth_requests']})")
+    print(f"Telegram calls: {results['telegram_calls']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bot.py against local fake RPC, Telegram and systemd.")
+    parser.add_argument("--chats", type=int, default=100, help="simulated chats (clicks and monitoring subscribers)")
+    parser.add_argument("--clicks", type=int, default=10, help="menu clicks per chat")
+    parser.add_argument("--rounds", type=int, default=3, help="monitoring rounds")
+    parser.add_argument("--fleet", type=int, default=50, help="fleet nodes served by the fake RPC")
+    parser.add_argument("--validators", type=int, default=300, help="validator set size")
+    parser.add_argument("--peers", type=int, default=40, help="peers reported by /net_info")
+    parser.add_argument("--block-time", type=float, default=1.0, help="seconds per fake block")
+    parser.add_argument("--valset-every", type=int, default=50, help="blocks between validator set changes")
+    parser.add_argument("--miss-rate", type=float, default=0.01, help="probability our validator misses a block")
+    parser.add_argument("--rpc-latency", type=float, default=5.0, help="mean fake RPC latency in ms")
+    parser.add_argument("--rpc-errors", type=float, default=0.0, help="fraction of fake RPC requests that fail")
+    parser.add_argument("--telegram-latency", type=float, default=20.0, help="mean fake Telegram API latency in ms")
+    parser.add_argument("--telegram-rate", type=float, default=1000.0, help="TELEGRAM_GLOBAL_RATE for the run")
+    parser.add_argument("--exec-delay", type=float, default=5.0, help="fake systemctl/journalctl startup delay in ms")
+    parser.add_argument("--geth", choices=["ipc", "http"], default="ipc", help="how the bot reaches the fake story-geth")
+    parser.add_argument("--mode", choices=["poll", "websocket"], default="poll", help="MONITOR_MODE for the run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds to let background loops settle")
+    parser.add_argument("--timeout", type=float, default=60.0, help="max seconds to wait for a monitoring round")
+    parser.add_argument("--log-level", default="WARNING", help="bot log level during the run")
+    parser.add_argument("--json", metavar="PATH", help="also write the raw results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+    report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
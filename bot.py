@@ -1,17 +1,36 @@
 import os
+import re
+import base64
+import json
 import asyncio
 import aiohttp
+from aiohttp import web
 import logging
 import tempfile
+import time
+import random
+import itertools
+import heapq
+import sqlite3
+import threading
+import zlib
 from functools import wraps
+from array import array
+from collections import deque
+from datetime import datetime
 import socket
 import psutil
-import subprocess
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes, ConversationHandler, MessageHandler, filters
 from dotenv import load_dotenv
 from typing import List, Tuple
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 load_dotenv()
 
 logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
@@ -26,6 +45,85 @@ SERVER_PORT = os.getenv("SERVER_PORT", "26657")
 RPC_ENDPOINT_1 = os.getenv("RPC_ENDPOINT_1")
 RPC_ENDPOINT_2 = os.getenv("RPC_ENDPOINT_2")
 ADMIN_ID = int(os.getenv("ADMIN_ID", "0"))
+RPC_CONNECT_TIMEOUT = float(os.getenv("RPC_CONNECT_TIMEOUT", 3))
+RPC_READ_TIMEOUT = float(os.getenv("RPC_READ_TIMEOUT", 10))
+RPC_LIMIT_PER_HOST = int(os.getenv("RPC_LIMIT_PER_HOST", 8))
+RPC_KEEPALIVE = float(os.getenv("RPC_KEEPALIVE", 120))
+RPC_ENDPOINTS = list(dict.fromkeys(
+    e.strip() for e in [RPC_ENDPOINT_1, RPC_ENDPOINT_2, *os.getenv("RPC_ENDPOINTS", "").split(",")] if e and e.strip()
+))
+REFERENCE_GRACE = float(os.getenv("REFERENCE_GRACE", 0.3))
+REFERENCE_STALE_BLOCKS = int(os.getenv("REFERENCE_STALE_BLOCKS", 10))
+SNAPSHOT_TTL = float(os.getenv("SNAPSHOT_TTL", 3))
+SYSTEMCTL_TIMEOUT = float(os.getenv("SYSTEMCTL_TIMEOUT", 10))
+RESTART_TIMEOUT = float(os.getenv("RESTART_TIMEOUT", 120))
+CONCURRENT_UPDATES = int(os.getenv("CONCURRENT_UPDATES", 64))
+STATE_DIR = os.getenv("STATE_DIR", "state")
+STATE_DB_PATH = os.getenv("STATE_DB_PATH", os.path.join(STATE_DIR, "state.db"))
+STATE_SAVE_INTERVAL = float(os.getenv("STATE_SAVE_INTERVAL", 30))
+STATE_HISTORY_SAVE_INTERVAL = float(os.getenv("STATE_HISTORY_SAVE_INTERVAL", 3600))
+LOG_BUFFER_LINES = int(os.getenv("LOG_BUFFER_LINES", 2000))
+LOG_VIEW_LINES = int(os.getenv("LOG_VIEW_LINES", 100))
+LOG_DB_PATH = os.getenv("LOG_DB_PATH", os.path.join(STATE_DIR, "logs.db"))
+LOG_RETENTION_DAYS = float(os.getenv("LOG_RETENTION_DAYS", 7))
+LOG_DB_MAX_MB = int(os.getenv("LOG_DB_MAX_MB", 512))
+LOG_SEARCH_LIMIT = int(os.getenv("LOG_SEARCH_LIMIT", 50))
+METRICS_SAMPLE_INTERVAL = float(os.getenv("METRICS_SAMPLE_INTERVAL", 5))
+METRICS_HISTORY_SECONDS = int(os.getenv("METRICS_HISTORY_SECONDS", 3600))
+HEIGHT_SAMPLE_INTERVAL = float(os.getenv("HEIGHT_SAMPLE_INTERVAL", 15))
+HEIGHT_REFERENCE_INTERVAL = float(os.getenv("HEIGHT_REFERENCE_INTERVAL", 60))
+HEIGHT_HISTORY_SECONDS = int(os.getenv("HEIGHT_HISTORY_SECONDS", 6 * 3600))
+HEIGHT_RATE_WINDOW = float(os.getenv("HEIGHT_RATE_WINDOW", 300))
+HEIGHT_STALL_SECONDS = float(os.getenv("HEIGHT_STALL_SECONDS", 60))
+FLEET_CONFIG = os.getenv("FLEET_CONFIG")
+FLEET_CONCURRENCY = int(os.getenv("FLEET_CONCURRENCY", 64))
+FLEET_TIMEOUT = float(os.getenv("FLEET_TIMEOUT", 5))
+FLEET_LAG_WARN = int(os.getenv("FLEET_LAG_WARN", 10))
+MONITORING_TICK = float(os.getenv("MONITORING_TICK", 10))
+MONITOR_MODE = os.getenv("MONITOR_MODE", "poll").lower()
+WS_VALIDATOR_UPDATES = os.getenv("WS_VALIDATOR_UPDATES", "false").lower() in ("1", "true", "yes")
+BLOCK_DEADLINE = float(os.getenv("BLOCK_DEADLINE", 30))
+MONITORING_DIGEST = os.getenv("MONITORING_DIGEST", "true").lower() in ("1", "true", "yes")
+ALERT_INTERVAL = float(os.getenv("ALERT_INTERVAL", 15))
+ALERT_COOLDOWN = float(os.getenv("ALERT_COOLDOWN", 600))
+ALERT_LAG_BLOCKS = int(os.getenv("ALERT_LAG_BLOCKS", 20))
+ALERT_DISK_PERCENT = float(os.getenv("ALERT_DISK_PERCENT", 90))
+ALERT_MIN_PEERS = int(os.getenv("ALERT_MIN_PEERS", 5))
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", 25))
+TELEGRAM_CHAT_INTERVAL = float(os.getenv("TELEGRAM_CHAT_INTERVAL", 1))
+OUTBOUND_MAX_PENDING = int(os.getenv("OUTBOUND_MAX_PENDING", 50))
+TELEGRAM_MESSAGE_LIMIT = 4096
+SIGNING_WINDOW = int(os.getenv("SIGNING_WINDOW", 10000))
+SIGNING_BATCH = int(os.getenv("SIGNING_BATCH", 20))
+SIGNING_INTERVAL = float(os.getenv("SIGNING_INTERVAL", 5))
+SIGNING_BACKFILL = int(os.getenv("SIGNING_BACKFILL", 1000))
+ALERT_MISSED_STREAK = int(os.getenv("ALERT_MISSED_STREAK", 5))
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+LATENCY_SAMPLES = int(os.getenv("LATENCY_SAMPLES", 512))
+LATENCY_LOG_SLOW = float(os.getenv("LATENCY_LOG_SLOW", 0))
+PROCESS_SAMPLE_INTERVAL = float(os.getenv("PROCESS_SAMPLE_INTERVAL", 10))
+PROCESS_TREND_WINDOW = float(os.getenv("PROCESS_TREND_WINDOW", 3600))
+ALERT_RSS_GROWTH_MB_HOUR = float(os.getenv("ALERT_RSS_GROWTH_MB_HOUR", 256))
+NET_CONNECTIONS_INTERVAL = float(os.getenv("NET_CONNECTIONS_INTERVAL", 60))
+EXPORT_CODEC = os.getenv("EXPORT_CODEC", "gz")
+EXPORT_CHUNK_MB = float(os.getenv("EXPORT_CHUNK_MB", 45))
+EXPORT_UPLOAD_TIMEOUT = float(os.getenv("EXPORT_UPLOAD_TIMEOUT", 600))
+GETH_IPC_PATH = os.path.expanduser(os.getenv("GETH_IPC_PATH", "~/.story/geth/odyssey/geth.ipc"))
+GETH_RPC_URL = os.getenv("GETH_RPC_URL", "http://localhost:8545")
+EL_SAMPLE_INTERVAL = float(os.getenv("EL_SAMPLE_INTERVAL", 1))
+ALERT_EL_DIVERGENCE = int(os.getenv("ALERT_EL_DIVERGENCE", 10))
+STORY_DATA_DIR = os.path.expanduser(os.getenv("STORY_DATA_DIR", "~/.story/story/data"))
+GETH_DATA_DIR = os.path.expanduser(os.getenv("GETH_DATA_DIR", "~/.story/geth/odyssey/geth"))
+DISK_SCAN_INTERVAL = float(os.getenv("DISK_SCAN_INTERVAL", 300))
+DISK_HISTORY_SECONDS = int(os.getenv("DISK_HISTORY_SECONDS", 7 * 86400))
+DISK_FORECAST_WINDOW = float(os.getenv("DISK_FORECAST_WINDOW", 86400))
+ALERT_DISK_FULL_DAYS = float(os.getenv("ALERT_DISK_FULL_DAYS", 7))
+PEER_SAMPLE_INTERVAL = float(os.getenv("PEER_SAMPLE_INTERVAL", 30))
+PEER_CHURN_WINDOW = float(os.getenv("PEER_CHURN_WINDOW", 3600))
+
+NODE_RPC_URL = f"http://localhost:{SERVER_PORT}"
+NODE_WS_URL = f"ws://localhost:{SERVER_PORT}/websocket"
 
 def safe_get(data, *keys, default="Not available"):
     for key in keys:
@@ -50,20 +148,513 @@ def admin_only(func):
     return wrapped
 
 
+class LatencyStats:
+    # Per-operation timings kept in process: a bounded reservoir of recent
+    # durations for percentiles, fixed histogram buckets for /metrics, error
+    # counts, and the most recent operations overall for a "slowest" list.
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self, samples: int, slow_log: float):
+        self.samples = samples
+        self.slow_log = slow_log
+        self.ops = {}
+        self.recent = deque(maxlen=samples)
+
+    def record(self, name: str, seconds: float, error: bool = False) -> None:
+        op = self.ops.get(name)
+        if op is None:
+            op = self.ops[name] = {
+                "count": 0, "errors": 0, "sum": 0.0,
+                "buckets": [0] * len(self.BUCKETS), "samples": deque(maxlen=self.samples),
+            }
+        op["count"] += 1
+        op["sum"] += seconds
+        op["errors"] += error
+        op["samples"].append(seconds)
+        for index, bound in enumerate(self.BUCKETS):
+            if seconds <= bound:
+                op["buckets"][index] += 1
+                break
+        self.recent.append((time.time(), name, seconds, error))
+        if self.slow_log and seconds >= self.slow_log:
+            logger.warning(f"Slow operation {name}: {seconds * 1000:.0f} ms{' (failed)' if error else ''}")
+
+    def timed(self, name: str) -> "LatencyTimer":
+        return LatencyTimer(self, name)
+
+    def percentiles(self, name: str, pcts=(50, 95, 99)) -> List[float]:
+        ordered = sorted(self.ops[name]["samples"])
+        return [ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] for pct in pcts]
+
+    def slowest(self, count: int = 10) -> list:
+        return sorted(self.recent, key=lambda item: item[2], reverse=True)[:count]
+
+
+class LatencyTimer:
+    __slots__ = ("stats", "name", "started")
+
+    def __init__(self, stats: LatencyStats, name: str):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # A cancelled operation was not slow or broken, it was abandoned.
+        if exc_type is not asyncio.CancelledError:
+            self.stats.record(self.name, time.perf_counter() - self.started, exc_type is not None)
+        return False
+
+
+latency = LatencyStats(LATENCY_SAMPLES, LATENCY_LOG_SLOW)
+
+
+def instrumented(func):
+    @wraps(func)
+    async def wrapped(*args, **kwargs):
+        with latency.timed(f"handler {func.__name__}"):
+            return await func(*args, **kwargs)
+    return wrapped
+
+
+class RpcClient:
+    # One keep-alive session for the whole process: the node RPC and the remote
+    # reference endpoints are hit on every click and monitoring tick, so reusing
+    # connections saves a TCP/TLS handshake and a DNS lookup per request.
+    def __init__(self):
+        self._session = None
+
+    async def start(self) -> None:
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=max(RPC_LIMIT_PER_HOST * 8, FLEET_CONCURRENCY * 2),
+            limit_per_host=RPC_LIMIT_PER_HOST,
+            keepalive_timeout=RPC_KEEPALIVE,
+            ttl_dns_cache=300,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=RPC_CONNECT_TIMEOUT + RPC_READ_TIMEOUT,
+            connect=RPC_CONNECT_TIMEOUT,
+            sock_read=RPC_READ_TIMEOUT,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    async def get_json(self, url: str, params: dict = None) -> dict:
+        session = await self.session()
+        with latency.timed(f"rpc {url}"):
+            async with session.get(url, params=params) as response:
+                if response.status != 200:
+                    raise Exception(f"Failed to fetch data from {url}, Status Code: {response.status}")
+                return await response.json(content_type=None)
+
+    async def post_json(self, url: str, payload) -> dict:
+        session = await self.session()
+        with latency.timed(f"rpc {url} (post)"):
+            async with session.post(url, json=payload) as response:
+                if response.status != 200:
+                    raise Exception(f"Failed to post to {url}, Status Code: {response.status}")
+                return await response.json(content_type=None)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+rpc_client = RpcClient()
+
+
 async def fetch_latest_block(rpc_endpoint: str) -> int:
-    async with aiohttp.ClientSession() as session:
-        async with session.get(rpc_endpoint) as response:
-            if response.status == 200:
-                data = await response.json()
-                latest_block = int(data['result']['sync_info']['latest_block_height'])
-                return latest_block
-            else:
-                raise Exception(f"Failed to fetch data from {rpc_endpoint}, Status Code: {response.status}")
+    data = await rpc_client.get_json(rpc_endpoint)
+    return int(data['result']['sync_info']['latest_block_height'])
+
+
+class EndpointHealth:
+    ALPHA = 0.3
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency = None
+        self.error_rate = 0.0
+        self.lag = 0.0
+        self.skipped = 0
+
+    def _ewma(self, old: float, new: float) -> float:
+        return new if old is None else old + self.ALPHA * (new - old)
+
+    def record_success(self, latency: float) -> None:
+        self.latency = self._ewma(self.latency, latency)
+        self.error_rate = self._ewma(self.error_rate, 0.0)
+
+    def record_failure(self) -> None:
+        self.error_rate = self._ewma(self.error_rate, 1.0)
+
+    def record_timeout(self, elapsed: float) -> None:
+        # Cancelled after a faster endpoint answered: we only know a lower bound.
+        self.latency = self._ewma(self.latency, max(elapsed, self.latency or 0.0))
+
+    def record_lag(self, blocks: int) -> None:
+        self.lag = self._ewma(self.lag, float(blocks))
+
+    @property
+    def demoted(self) -> bool:
+        return self.error_rate > 0.5 or self.lag > REFERENCE_STALE_BLOCKS
+
+    @property
+    def score(self) -> float:
+        return (self.latency or 0.0) * (1 + 4 * self.error_rate) + self.lag
+
+
+class ReferenceHeightResolver:
+    # Demoted endpoints are left out of the fan-out and only re-probed every
+    # PROBE_EVERY rounds (or whenever no healthy endpoint is left).
+    PROBE_EVERY = 5
+
+    def __init__(self, endpoints: List[str]):
+        self.health = {url: EndpointHealth(url) for url in endpoints}
+
+    def _select(self) -> List[EndpointHealth]:
+        healthy = [h for h in self.health.values() if not h.demoted]
+        selected = list(healthy)
+        for h in self.health.values():
+            if not h.demoted:
+                continue
+            h.skipped += 1
+            if not healthy or h.skipped >= self.PROBE_EVERY:
+                h.skipped = 0
+                selected.append(h)
+        return sorted(selected, key=lambda h: h.score)
+
+    async def _query(self, health: EndpointHealth) -> int:
+        started = time.monotonic()
+        try:
+            height = await fetch_latest_block(health.url)
+        except asyncio.CancelledError:
+            health.record_timeout(time.monotonic() - started)
+            raise
+        except Exception as e:
+            health.record_failure()
+            logger.warning(f"Error fetching from {health.url}: {e}")
+            raise
+        health.record_success(time.monotonic() - started)
+        return height
+
+    async def resolve(self) -> int:
+        if not self.health:
+            raise Exception("No reference RPC endpoints configured")
+
+        loop = asyncio.get_running_loop()
+        tasks = {asyncio.create_task(self._query(h)): h for h in self._select()}
+        pending = set(tasks)
+        results = {}
+        deadline = None
+        try:
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        results[tasks[task].url] = task.result()
+                # After the first good answer, give the others a short grace
+                # window so a lagging endpoint cannot win with a stale height.
+                if results and deadline is None:
+                    deadline = loop.time() + REFERENCE_GRACE
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if not results:
+            raise Exception("All reference RPC endpoints failed")
+
+        best = max(results.values())
+        for url, height in results.items():
+            self.health[url].record_lag(best - height)
+        logger.info(f"Reference block height {best} from {len(results)}/{len(tasks)} endpoints")
+        return best
+
+
+reference_resolver = ReferenceHeightResolver(RPC_ENDPOINTS)
+
+
+class SnapshotCache:
+    # Short-lived cache in front of the RPC calls. Concurrent callers asking for
+    # the same key while a fetch is running all await that one fetch.
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._values = {}
+        self._inflight = {}
+
+    async def get(self, key: str, fetch, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        cached = self._values.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._refresh(key, fetch))
+            inflight.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._inflight[key] = inflight
+        # Shielded so a caller that gives up does not cancel the fetch for the others.
+        return await asyncio.shield(inflight)
+
+    async def _refresh(self, key: str, fetch):
+        try:
+            value = await fetch()
+            self._values[key] = (time.monotonic(), value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def peek(self, key: str, default=None):
+        cached = self._values.get(key)
+        return default if cached is None else cached[1]
+
+    def age(self, key: str) -> float:
+        cached = self._values.get(key)
+        return None if cached is None else time.monotonic() - cached[0]
+
+    def invalidate(self, key: str) -> None:
+        self._values.pop(key, None)
+
+
+snapshots = SnapshotCache(SNAPSHOT_TTL)
+
+
+background_tasks = set()
+
+
+def start_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+async def wait_event(event: asyncio.Event, timeout: float = None) -> bool:
+    # Not asyncio.wait_for: before Python 3.12 it can swallow a cancellation
+    # that races with the event being set, which left stop_background() hanging.
+    waiter = asyncio.ensure_future(event.wait())
+    try:
+        done, _ = await asyncio.wait({waiter}, timeout=timeout)
+    finally:
+        waiter.cancel()
+    return bool(done)
+
+
+async def stop_background() -> None:
+    tasks = list(background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class RingSeries:
+    # Fixed-size (timestamp, value) history backed by two array('d') buffers,
+    # so memory stays constant however long the bot runs.
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.times = array('d', [0.0]) * self.capacity
+        self.values = array('d', [0.0]) * self.capacity
+        self.count = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, value: float) -> None:
+        self.times[self._next] = timestamp
+        self.values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def latest(self) -> float:
+        return self.values[self._next - 1] if self.count else None
+
+    def latest_time(self) -> float:
+        return self.times[self._next - 1] if self.count else None
+
+    def points(self, seconds: float = None, now: float = None) -> List[Tuple[float, float]]:
+        # Oldest first, optionally limited to the last `seconds`.
+        cutoff = None if seconds is None else (now if now is not None else time.time()) - seconds
+        result = []
+        index = self._next
+        for _ in range(self.count):
+            index = (index - 1) % self.capacity
+            if cutoff is not None and self.times[index] < cutoff:
+                break
+            result.append((self.times[index], self.values[index]))
+        result.reverse()
+        return result
+
+    def window(self, seconds: float = None) -> List[float]:
+        return [value for _, value in self.points(seconds)]
+
+    def average(self, seconds: float = None) -> float:
+        values = self.window(seconds)
+        return sum(values) / len(values) if values else None
+
+    def percentile(self, seconds: float, pct: float) -> float:
+        values = sorted(self.window(seconds))
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+    def slope(self, seconds: float = None) -> float:
+        # Least-squares trend in units per second; None without enough spread.
+        points = self.points(seconds)
+        if len(points) < 3 or points[-1][0] - points[0][0] <= 0:
+            return None
+        t0 = points[0][0]
+        n = len(points)
+        mean_t = sum(t - t0 for t, _ in points) / n
+        mean_v = sum(v for _, v in points) / n
+        var_t = sum((t - t0 - mean_t) ** 2 for t, _ in points)
+        if var_t == 0:
+            return None
+        return sum((t - t0 - mean_t) * (v - mean_v) for t, v in points) / var_t
+
+    def dump(self) -> dict:
+        # Oldest first, packed as base64 doubles to keep the saved state small.
+        # Slicing the buffers keeps this in C instead of building point tuples.
+        start = self._next if self.count == self.capacity else 0
+        ordered = lambda buffer: buffer[start:self.count] + buffer[:start]
+        return {
+            "times": base64.b64encode(ordered(self.times).tobytes()).decode(),
+            "values": base64.b64encode(ordered(self.values).tobytes()).decode(),
+        }
+
+    def restore(self, data: dict) -> None:
+        times, values = array('d'), array('d')
+        times.frombytes(base64.b64decode(data["times"]))
+        values.frombytes(base64.b64decode(data["values"]))
+        for timestamp, value in zip(times, values):
+            if not self.count or timestamp > self.latest_time():
+                self.append(timestamp, value)
+
+
+class StateStore:
+    # Key -> JSON document store in SQLite for everything that should survive
+    # a restart. Rows are read in one query at startup but only decoded when
+    # their owner attaches; saves serialize the attached documents and write
+    # just the ones that changed, on a worker thread. Histories change between
+    # every save, so they are only saved every history_interval and on close.
+    def __init__(self, path: str, interval: float, history_interval: float):
+        self.path = path
+        self.interval = interval
+        self.history_interval = history_interval
+        self.raw = {}
+        self.saved = {}
+        self.dumps = {}
+        self.histories = set()
+        self._history_saved = time.monotonic()
+        self._conn = None
+        self._lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL)")
+        self.raw = dict(conn.execute("SELECT key, value FROM state"))
+        self.saved = dict(self.raw)
+        self._conn = conn
+
+    def attach(self, key: str, restore, dump, history: bool = False) -> None:
+        # restore(document) runs now if the key was saved before; dump() on
+        # every save, or every history_interval for history documents.
+        self.dumps[key] = dump
+        if history:
+            self.histories.add(key)
+        raw = self.raw.pop(key, None)
+        if raw is None:
+            return
+        try:
+            restore(json.loads(raw))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring saved state {key}: {e}")
+
+    def save_soon(self) -> None:
+        self._wakeup.set()
+
+    def _write(self, documents: dict) -> dict:
+        changed = {}
+        for key, document in documents.items():
+            try:
+                text = json.dumps(document, separators=(",", ":"))
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Cannot save state {key}: {e}")
+                continue
+            if self.saved.get(key) != text:
+                changed[key] = text
+        if changed:
+            now = time.time()
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO state (key, value, updated) VALUES (?, ?, ?)",
+                    [(key, text, now) for key, text in changed.items()]
+                )
+        return changed
+
+    async def open(self) -> None:
+        try:
+            await asyncio.to_thread(self._open)
+            logger.info(f"Loaded {len(self.raw)} saved state documents from {self.path}")
+        except sqlite3.Error as e:
+            logger.error(f"State persistence disabled, could not open {self.path}: {e}")
+
+    async def save(self, histories: bool = None) -> None:
+        if self._conn is None:
+            return
+        if histories is None:
+            histories = time.monotonic() - self._history_saved >= self.history_interval
+        if histories:
+            self._history_saved = time.monotonic()
+        # dump() reads live state, so it runs on the loop; only encoding and I/O are offloaded.
+        documents = {key: dump() for key, dump in self.dumps.items() if histories or key not in self.histories}
+        self.saved.update(await asyncio.to_thread(self._write, documents))
+
+    async def run(self) -> None:
+        while True:
+            await wait_event(self._wakeup, self.interval)
+            self._wakeup.clear()
+            try:
+                await self.save()
+            except sqlite3.Error as e:
+                logger.error(f"Error saving bot state: {e}")
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            try:
+                await self.save(histories=True)
+            except sqlite3.Error as e:
+                logger.error(f"Error saving bot state: {e}")
+            self._conn.close()
+            self._conn = None
+
+
+state_store = StateStore(STATE_DB_PATH, STATE_SAVE_INTERVAL, STATE_HISTORY_SAVE_INTERVAL)
+
+
 @admin_only
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await show_main_menu(update, context)
 
 
+@instrumented
 async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     keyboard = [
         [InlineKeyboardButton("📊 Status", callback_data="status")],
@@ -73,9 +664,12 @@ async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
          InlineKeyboardButton("🔍 Monitor", callback_data="monitor")],
         [InlineKeyboardButton("📈 Performance", callback_data="performance"),
          InlineKeyboardButton("🌐 Network", callback_data="network")],
-        [InlineKeyboardButton("✅ Validator", callback_data="validator"),
-         InlineKeyboardButton("❓ Help", callback_data="help")],
+        [InlineKeyboardButton("👥 Peers", callback_data="peers"),
+         InlineKeyboardButton("✅ Validator", callback_data="validator")],
+        [InlineKeyboardButton("❓ Help", callback_data="help")],
     ]
+    if FLEET_NODES:
+        keyboard.insert(1, [InlineKeyboardButton("🛰 Fleet", callback_data="fleet")])
     reply_markup = InlineKeyboardMarkup(keyboard)
     
     if update.message:
@@ -101,89 +695,160 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         "monitor": show_monitor_menu,
         "performance": performance_metrics,
         "network": network_stats,
+        "peers": peers_view,
         "validator": validator_info,
+        "fleet": fleet_overview,
         "help": help_command
     }
 
     if query.data in handlers:
         await handlers[query.data](update, context)
     elif query.data.startswith("logs_"):
-        service = query.data.split("_")[1]
-        await view_logs(update, context, service)
+        service = query.data.split("_", 1)[1]
+        await show_log_filter_options(update, context, service)
+    elif query.data.startswith("log_filter_"):
+        await handle_log_filter(update, context)
+    elif query.data.startswith("log_export_"):
+        service, hours = query.data[len("log_export_"):].rsplit("_", 1)
+        await export_logs_button(update, context, service, int(hours))
+    elif query.data.startswith("fleet_"):
+        await fleet_node_view(update, context, int(query.data.split("_", 1)[1]))
     elif query.data.startswith("restart_"):
         service = query.data.split("_")[1]
         await restart_service(update, context, service)
     elif query.data.startswith("monitor_"):
-        action = query.data.split("_")[1]
+        action, _, argument = query.data[len("monitor_"):].partition("_")
         if action == "activate":
             await activate_monitoring(update, context)
         elif action == "deactivate":
             await deactivate_monitoring(update, context)
         elif action == "status":
             await view_monitoring_status(update, context)
+        elif action == "interval":
+            await show_monitoring_intervals(update, context, int(argument) if argument else None)
+        elif action == "sections":
+            await show_monitoring_sections(update, context, argument or None)
+        elif action == "digest":
+            await toggle_monitoring_digest(update, context)
     elif query.data == "start":
         await show_main_menu(update, context)
 
+@instrumented
 async def show_log_options(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    story = STORY_SERVICE or "story"
+    story_geth = STORY_GETH_SERVICE or "story-geth"
     keyboard = [
-        [InlineKeyboardButton("story Logs", callback_data="logs_story"),
-         InlineKeyboardButton("story-geth Logs", callback_data="logs_story-geth")],
+        [InlineKeyboardButton(f"{story} Logs", callback_data=f"logs_{story}"),
+         InlineKeyboardButton(f"{story_geth} Logs", callback_data=f"logs_{story_geth}")],
         [InlineKeyboardButton("Back to Main Menu", callback_data="start")]
     ]
     reply_markup = InlineKeyboardMarkup(keyboard)
     await update.callback_query.edit_message_text("Choose which logs to view:", reply_markup=reply_markup)
 
-async def show_monitor_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+def monitor_menu_markup() -> InlineKeyboardMarkup:
     keyboard = [
         [InlineKeyboardButton("✅ Activate Monitoring", callback_data="monitor_activate")],
         [InlineKeyboardButton("❌ Deactivate Monitoring", callback_data="monitor_deactivate")],
+        [InlineKeyboardButton("⏱ Interval", callback_data="monitor_interval"),
+         InlineKeyboardButton("🧩 Sections", callback_data="monitor_sections")],
+        [InlineKeyboardButton("📰 Toggle Periodic Digest", callback_data="monitor_digest")],
         [InlineKeyboardButton("📋 View Monitoring Status", callback_data="monitor_status")],
         [InlineKeyboardButton("⬅️ Back to Main Menu", callback_data="start")]
     ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    await update.callback_query.edit_message_text("🔍 Monitor Options:", reply_markup=reply_markup)
+    return InlineKeyboardMarkup(keyboard)
+
+async def show_monitor_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await update.callback_query.edit_message_text("🔍 Monitor Options:", reply_markup=monitor_menu_markup())
 
 async def activate_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
-    if context.chat_data.get('monitoring', False):
+    if monitoring_hub.get(chat_id):
         message = "🔍 Monitoring is already active."
     else:
-        context.chat_data['monitoring'] = True
-        context.job_queue.run_repeating(send_monitoring_update, interval=MONITORING_INTERVAL, first=10, chat_id=chat_id, name=f"monitor_{chat_id}")
-        message = f"✅ Monitoring activated. You'll receive updates every {MONITORING_INTERVAL // 60} minutes."
+        monitoring_hub.subscribe(chat_id)
+        message = f"✅ Monitoring activated. You'll receive updates every {format_duration(MONITORING_INTERVAL)}."
     
     await update.callback_query.answer()
     await show_monitor_menu_with_message(update, context, message)
 
 async def deactivate_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
-    if not context.chat_data.get('monitoring', False):
+    if not monitoring_hub.get(chat_id):
         message = "🔍 Monitoring is already inactive."
     else:
-        context.chat_data['monitoring'] = False
-        current_jobs = context.job_queue.get_jobs_by_name(f"monitor_{chat_id}")
-        for job in current_jobs:
-            job.schedule_removal()
+        monitoring_hub.unsubscribe(chat_id)
         message = "❌ Monitoring deactivated."
     
     await update.callback_query.answer()
     await show_monitor_menu_with_message(update, context, message)
 
 async def show_monitor_menu_with_message(update: Update, context: ContextTypes.DEFAULT_TYPE, message: str) -> None:
+    await update.callback_query.edit_message_text(f"{message}\n\n🔍 Monitor Options:", reply_markup=monitor_menu_markup())
+
+async def show_monitoring_intervals(update: Update, context: ContextTypes.DEFAULT_TYPE, interval: int = None) -> None:
+    chat_id = update.effective_chat.id
+    subscription = monitoring_hub.get(chat_id)
+    if subscription is None:
+        await show_monitor_menu_with_message(update, context, "⏱ Activate monitoring first to choose its interval.")
+        return
+    if interval is not None:
+        monitoring_hub.set_interval(chat_id, interval)
+        await show_monitor_menu_with_message(update, context, f"⏱ Updates every {format_duration(interval)}.")
+        return
+
+    current = subscription["interval"]
+    choices = sorted({60, 300, 900, 3600, MONITORING_INTERVAL})
     keyboard = [
-        [InlineKeyboardButton("✅ Activate Monitoring", callback_data="monitor_activate")],
-        [InlineKeyboardButton("❌ Deactivate Monitoring", callback_data="monitor_deactivate")],
-        [InlineKeyboardButton("📋 View Monitoring Status", callback_data="monitor_status")],
-        [InlineKeyboardButton("⬅️ Back to Main Menu", callback_data="start")]
+        [InlineKeyboardButton(("✅ " if value == current else "") + format_duration(value), callback_data=f"monitor_interval_{value}")]
+        for value in choices
     ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    await update.callback_query.edit_message_text(f"{message}\n\n🔍 Monitor Options:", reply_markup=reply_markup)
+    keyboard.append([InlineKeyboardButton("⬅️ Back to Monitor Menu", callback_data="monitor")])
+    await update.callback_query.edit_message_text("⏱ Choose how often to receive updates:", reply_markup=InlineKeyboardMarkup(keyboard))
+
+async def show_monitoring_sections(update: Update, context: ContextTypes.DEFAULT_TYPE, section: str = None) -> None:
+    chat_id = update.effective_chat.id
+    subscription = monitoring_hub.get(chat_id)
+    if subscription is None:
+        await show_monitor_menu_with_message(update, context, "🧩 Activate monitoring first to choose its sections.")
+        return
+    if section in MONITORING_SECTIONS:
+        monitoring_hub.toggle_section(chat_id, section)
+
+    keyboard = [
+        [InlineKeyboardButton(("✅ " if name in subscription["sections"] else "⬜ ") + label, callback_data=f"monitor_sections_{name}")]
+        for name, label in MONITORING_SECTIONS.items()
+        if (name != "fleet" or FLEET_NODES) and (name != "execution" or EXECUTION_MONITORING)
+    ]
+    keyboard.append([InlineKeyboardButton("⬅️ Back to Monitor Menu", callback_data="monitor")])
+    await update.callback_query.edit_message_text("🧩 Choose which sections to receive:", reply_markup=InlineKeyboardMarkup(keyboard))
+
+async def toggle_monitoring_digest(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    chat_id = update.effective_chat.id
+    subscription = monitoring_hub.get(chat_id)
+    if subscription is None:
+        await show_monitor_menu_with_message(update, context, "📰 Activate monitoring first to configure the periodic digest.")
+        return
+    if monitoring_hub.toggle_digest(chat_id):
+        message = f"📰 Periodic digest enabled (every {format_duration(subscription['interval'])}), alerts are always sent."
+    else:
+        message = "📰 Periodic digest disabled. You'll only receive alerts and resolutions."
+    await show_monitor_menu_with_message(update, context, message)
 
+@instrumented
 async def view_monitoring_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    monitoring = context.chat_data.get('monitoring', False)
+    subscription = monitoring_hub.get(update.effective_chat.id)
     status_message = "🔍 **Monitoring Status:**\n\n"
-    status_message += f"• **Active**: {'✅ Yes' if monitoring else '❌ No'}\n"
-    status_message += f"• **Monitoring Interval**: {MONITORING_INTERVAL // 60} minutes\n"
+    status_message += f"• **Active**: {'✅ Yes' if subscription else '❌ No'}\n"
+    if subscription:
+        sections = ", ".join(MONITORING_SECTIONS[name] for name in MONITORING_SECTIONS if name in subscription["sections"])
+        status_message += f"• **Monitoring Interval**: {format_duration(subscription['interval'])}\n"
+        status_message += f"• **Sections**: {sections or 'none'}\n"
+        status_message += f"• **Periodic Digest**: {'on' if subscription['digest'] else 'off'}\n"
+    status_message += f"• **Subscribed Chats**: {len(monitoring_hub.subscribers)}\n"
+    firing = alert_engine.firing()
+    status_message += f"\n🚨 **Active Alerts**: {len(firing)}\n"
+    for rule in firing:
+        status_message += f"• {rule.title}: {rule.fmt(rule.value)} (since {format_duration(time.time() - rule.fired_at)})\n"
     
     keyboard = [
         [InlineKeyboardButton("⬅️ Back to Monitor Menu", callback_data="monitor")],
@@ -206,15 +871,20 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     help_text = """
 📚 Available commands:
 • /start - Start the bot and show main menu
+• /search <keywords> [level=ERROR] [service=story] [since=6h] [until=1h] - Search stored logs
+• /latency - Latency percentiles and the slowest recent operations
+• /export <service> [since=2h] [until=30m] [level=ERROR] [format=gz|zst] - Export logs for a time window as compressed files
 
 🔘 Menu options:
 • 📊 Status - Check node status
+• 🛰 Fleet - Summary of all nodes in the fleet config (if configured)
 • 📜 Logs - View recent logs
 • 🔄 Restart Services - Restart story or story-geth service
 • 💻 System Info - Show system information
-• 🔍 Monitor - Toggle continuous monitoring
+• 🔍 Monitor - Toggle continuous monitoring, its interval and sections
 • 📈 Performance - View node performance metrics
 • 🌐 Network - Show network statistics
+• 👥 Peers - Peer count, joins/leaves and the best and worst peers by throughput
 • ✅ Validator - Show validator information
 • ❓ Help - Display this help message
 
@@ -239,309 +909,3132 @@ Thank you for using our Story Node Management Bot!
     await update.callback_query.edit_message_text(help_text, reply_markup=reply_markup, disable_web_page_preview=True)
 
 
-async def fetch_and_save_logs(service: str, lines: int = 100) -> str:
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.log') as temp_file:
-        process = await asyncio.create_subprocess_shell(
-            f"journalctl -u {service} -n {lines} --no-pager",
-            stdout=temp_file,
-            stderr=asyncio.subprocess.PIPE
-        )
-        await process.communicate()
-        return temp_file.name    
+LOG_LEVELS = ["ERROR", "WARNING", "INFO", "DEBUG"]
+LOG_LEVEL_PATTERN = re.compile(
+    r'\b(?:level=)?(ERROR|ERR|FATAL|CRIT|PANIC|WARNING|WARN|WRN|INFO|INF|DEBUG|DBG|TRACE|TRCE)\b',
+    re.IGNORECASE
+)
+LOG_LEVEL_ALIASES = {
+    "ERROR": "ERROR", "ERR": "ERROR", "FATAL": "ERROR", "CRIT": "ERROR", "PANIC": "ERROR",
+    "WARNING": "WARNING", "WARN": "WARNING", "WRN": "WARNING",
+    "INFO": "INFO", "INF": "INFO",
+    "DEBUG": "DEBUG", "DBG": "DEBUG", "TRACE": "DEBUG", "TRCE": "DEBUG",
+}
 
 
-def split_message(message: str, max_length: int = 4000) -> list:
-    parts = []
-    while len(message) > max_length:
-        split_index = message.rfind('\n', 0, max_length)
-        if split_index == -1:
-            split_index = max_length
-        parts.append(message[:split_index])
-        message = message[split_index:]
-    parts.append(message)
-    return parts
+def classify_log_level(priority: int, message: str) -> str:
+    # story and geth log everything to stdout at priority 6, so below
+    # warning the level has to be read from the line prefix itself.
+    if priority <= 3:
+        return "ERROR"
+    if priority == 4:
+        return "WARNING"
+    match = LOG_LEVEL_PATTERN.search(message, 0, 64)
+    if match:
+        return LOG_LEVEL_ALIASES[match.group(1).upper()]
+    return "DEBUG" if priority == 7 else "INFO"
 
 
-async def show_log_filter_options(update: Update, context: ContextTypes.DEFAULT_TYPE, service: str):
-    keyboard = [
-        [InlineKeyboardButton("All Levels", callback_data=f"log_filter_{service}_all")],
-        [InlineKeyboardButton("ERROR", callback_data=f"log_filter_{service}_ERROR")],
-        [InlineKeyboardButton("WARNING", callback_data=f"log_filter_{service}_WARNING")],
-        [InlineKeyboardButton("INFO", callback_data=f"log_filter_{service}_INFO")],
-        [InlineKeyboardButton("Back to Logs Menu", callback_data="logs")],
-        [InlineKeyboardButton("Back to Main Menu", callback_data="start")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    await update.callback_query.edit_message_text("Select log level to filter:", reply_markup=reply_markup)
+def parse_journal_entry(raw: bytes) -> Tuple[str, int, str, str]:
+    entry = json.loads(raw)
+    message = entry.get("MESSAGE") or ""
+    if isinstance(message, list):
+        message = bytes(message).decode(errors="replace")
+    priority = int(entry.get("PRIORITY") or 6)
+    timestamp = int(entry.get("__REALTIME_TIMESTAMP") or 0)
+    return entry.get("__CURSOR"), timestamp, classify_log_level(priority, message), message
 
-async def handle_log_filter(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    query = update.callback_query
-    _, service, level = query.data.split('_')[2:]
 
-    if level == 'all':
-        level = None
-    
-    await view_logs(update, context, service, level)
+def format_log_line(timestamp: int, message: str) -> str:
+    return f"{datetime.fromtimestamp(timestamp / 1e6):%Y-%m-%d %H:%M:%S} {message}"
 
-async def view_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, service: str, level: str = None):
-    try:
-        temp_file_path = await fetch_and_save_logs(service)
-        
-        with open(temp_file_path, 'rb') as log_file:
-            await context.bot.send_document(
-                chat_id=update.effective_chat.id,
-                document=log_file,
-                filename=f"{service}_logs.txt",
-                caption=f"Recent logs for {service}"
-            )
-        
-        os.unlink(temp_file_path)  
 
-        keyboard = [
-            [InlineKeyboardButton("Back to Logs Menu", callback_data="logs")],
-            [InlineKeyboardButton("Back to Main Menu", callback_data="start")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await update.callback_query.message.reply_text(
-            f"Logs for {service} have been sent as a file. Use the buttons below for more options:",
-            reply_markup=reply_markup
-        )
+class JournalFollower:
+    # Tails `journalctl -f -o json` for one unit into bounded ring buffers,
+    # bucketed by level, so the Logs views never spawn a process or touch disk.
+    def __init__(self, service: str, capacity: int = LOG_BUFFER_LINES, sink=None):
+        self.service = service
+        self.sink = sink
+        self.lines = deque(maxlen=capacity)
+        self.buckets = {level: deque(maxlen=capacity) for level in LOG_LEVELS}
+        self.cursor = None
 
-        await update.callback_query.answer()
-    except Exception as e:
-        await update.callback_query.message.reply_text(f"❌ Error fetching logs for {service}: {str(e)}")
-        await update.callback_query.answer()
+    def dump(self) -> str:
+        return self.cursor
 
+    def restore(self, cursor: str) -> None:
+        self.cursor = cursor or None
 
-async def restart_service(update: Update, context: ContextTypes.DEFAULT_TYPE, service_name: str) -> None:
-    try:
-        subprocess.run(["sudo", "systemctl", "restart", service_name], check=True)
-        message = f"✅ {service_name} service restarted successfully."
-    except subprocess.CalledProcessError as e:
-        message = f"❌ Error restarting {service_name} service: {str(e)}"
-    
-    keyboard = [[InlineKeyboardButton("Back to Main Menu", callback_data="start")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    await update.callback_query.edit_message_text(message, reply_markup=reply_markup)
+    def _command(self) -> List[str]:
+        args = ["journalctl", "-u", self.service, "-f", "-o", "json", "--no-pager",
+                "--output-fields=MESSAGE,PRIORITY"]
+        if self.cursor:
+            args.append(f"--after-cursor={self.cursor}")
+        else:
+            args += ["-n", str(self.lines.maxlen)]
+        return args
 
-async def fetch_node_status() -> dict:
-    node_rpc_url = f"http://localhost:{SERVER_PORT}/status"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(node_rpc_url) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                raise Exception(f"Failed to fetch node status, Status Code: {response.status}")
-async def compare_block_heights() -> Tuple[str, bool]:
-    try:
+    def add(self, timestamp: int, level: str, message: str) -> None:
+        item = (timestamp, level, format_log_line(timestamp, message))
+        self.lines.append(item)
+        self.buckets[level].append(item)
+        if self.sink is not None:
+            self.sink(self.service, timestamp, level, message)
 
-        try:
-            latest_block_rpc1 = await fetch_latest_block(RPC_ENDPOINT_1)
-            logger.info(f"Latest block from RPC_ENDPOINT_1: {latest_block_rpc1}")
-        except Exception as e:
-            logger.error(f"Error fetching from RPC_ENDPOINT_1: {e}")
+    def tail(self, level: str = None, count: int = LOG_VIEW_LINES) -> List[str]:
+        source = self.lines if level is None else self.buckets[level]
+        start = max(0, len(source) - count)
+        return [source[i][2] for i in range(start, len(source))]
 
-            latest_block_rpc1 = await fetch_latest_block(RPC_ENDPOINT_2)
-            logger.info(f"Latest block from RPC_ENDPOINT_2: {latest_block_rpc1}")
+    async def run(self) -> None:
+        backoff = 1
+        while True:
+            process = await asyncio.create_subprocess_exec(
+                *self._command(),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=1024 * 1024
+            )
+            try:
+                while True:
+                    raw = await process.stdout.readline()
+                    if not raw:
+                        break
+                    try:
+                        cursor, timestamp, level, message = parse_journal_entry(raw)
+                    except (ValueError, TypeError):
+                        continue
+                    self.add(timestamp, level, message)
+                    self.cursor = cursor or self.cursor
+                    backoff = 1
+            finally:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+            logger.warning(f"journalctl follower for {self.service} exited, restarting in {backoff}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
 
 
-        node_status = await fetch_node_status()
-        node_block_height = int(node_status['result']['sync_info']['latest_block_height'])
-        logger.info(f"Node's current block height: {node_block_height}")
+class LogStore:
+    # On-disk, full-text indexed copy of everything the journal followers see.
+    # Lines are buffered in memory and written in batches from a worker thread;
+    # old rows are pruned by age and by total database size.
+    FLUSH_INTERVAL = 2
+    PRUNE_INTERVAL = 300
 
+    def __init__(self, path: str, retention_days: float, max_mb: int):
+        self.path = path
+        self.retention_us = int(retention_days * 86400 * 1e6)
+        self.max_bytes = max_mb * 1024 * 1024
+        self.pending = []
+        self._conn = None
+        self._lock = threading.Lock()
 
-        if node_block_height < latest_block_rpc1:
-            difference = latest_block_rpc1 - node_block_height
-            message = (
-                f"🚨 **Block Synchronization Alert:**\n\n"
-                f"Your node is behind by {difference} blocks.\n"
-                f"Node Block Height: {node_block_height}\n"
-                f"Network Latest Block: {latest_block_rpc1}\n\n"
-                f"🔍 Please check your node to ensure it's operating correctly."
-            )
-            return message, False
-        else:
-            message = (
-                f"✅ **Block Synchronization Status:**\n\n"
-                f"Your node is fully synchronized.\n"
-                f"Node Block Height: {node_block_height}\n"
-                f"Network Latest Block: {latest_block_rpc1}"
-            )
-            return message, True
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY,
+                ts INTEGER NOT NULL,
+                service TEXT NOT NULL,
+                level TEXT NOT NULL,
+                message TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS logs_ts ON logs(ts);
+            CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(message, content='logs', content_rowid='id');
+            CREATE TRIGGER IF NOT EXISTS logs_ai AFTER INSERT ON logs BEGIN
+                INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message);
+            END;
+            CREATE TRIGGER IF NOT EXISTS logs_ad AFTER DELETE ON logs BEGIN
+                INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+            END;
+        """)
+        self._conn = conn
 
-    except Exception as e:
-        logger.error(f"Error in compare_block_heights: {e}")
-        return f"❌ **Block Synchronization Error:** {e}", False
+    def append(self, service: str, timestamp: int, level: str, message: str) -> None:
+        self.pending.append((timestamp, service, level, message))
 
-async def check_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    try:
+    def _write(self, rows: list) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT INTO logs (ts, service, level, message) VALUES (?, ?, ?, ?)", rows)
 
-        story_status = subprocess.check_output(["systemctl", "is-active", STORY_SERVICE]).decode().strip()
-        story_geth_status = subprocess.check_output(["systemctl", "is-active", STORY_GETH_SERVICE]).decode().strip()
+    def _size(self) -> int:
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (pages - free) * page_size
 
+    def _prune(self) -> None:
+        with self._lock:
+            with self._conn:
+                cutoff = int(time.time() * 1e6) - self.retention_us
+                self._conn.execute("DELETE FROM logs WHERE ts < ?", (cutoff,))
+            # Over budget: drop the oldest rows, sized so we land at ~90% of the budget.
+            while (size := self._size()) > self.max_bytes:
+                with self._conn:
+                    first, last = self._conn.execute("SELECT MIN(id), MAX(id) FROM logs").fetchone()
+                    if first is None:
+                        break
+                    fraction = max(0.1, 1 - 0.9 * self.max_bytes / size)
+                    self._conn.execute("DELETE FROM logs WHERE id <= ?", (first + int((last - first) * fraction),))
+                    # FTS deletes are only tombstones until the index is rewritten.
+                    self._conn.execute("INSERT INTO logs_fts(logs_fts) VALUES ('optimize')")
+            self._conn.execute("PRAGMA incremental_vacuum")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'http://localhost:{SERVER_PORT}/status') as resp:
-                if resp.status != 200:
-                    raise Exception(f"Failed to fetch Node status: HTTP {resp.status}")
-                status_data = await resp.json()
+    def _search(self, query: str, service: str, level: str, since: int, until: int, limit: int) -> list:
+        sql = "SELECT l.ts, l.service, l.level, l.message FROM logs l"
+        where, params = ["l.ts BETWEEN ? AND ?"], [since, until]
+        if query:
+            sql += " JOIN logs_fts f ON f.rowid = l.id"
+            where.append("logs_fts MATCH ?")
+            # Quote every term so user input is never parsed as FTS syntax.
+            params.append(" ".join('"' + term.replace('"', '""') + '"' for term in query.split()))
+        if service:
+            where.append("l.service = ?")
+            params.append(service)
+        if level:
+            where.append("l.level = ?")
+            params.append(level)
+        sql += " WHERE " + " AND ".join(where) + " ORDER BY l.id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
 
+    async def open(self) -> None:
+        await asyncio.to_thread(self._open)
 
-        node_info = status_data.get('result', {}).get('node_info', {})
-        sync_info = status_data.get('result', {}).get('sync_info', {})
-        validator_info = status_data.get('result', {}).get('validator_info', {})
+    async def search(self, query: str, service: str = None, level: str = None,
+                     since: int = 0, until: int = None, limit: int = LOG_SEARCH_LIMIT) -> list:
+        until = until if until is not None else int(time.time() * 1e6)
+        return await asyncio.to_thread(self._search, query, service, level, since, until, limit)
 
+    async def flush(self) -> None:
+        if self.pending and self._conn is not None:
+            rows, self.pending = self.pending, []
+            await asyncio.to_thread(self._write, rows)
 
-        block_message, is_synced = await compare_block_heights()
+    async def run(self) -> None:
+        last_prune = 0.0
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            try:
+                await self.flush()
+                if time.monotonic() - last_prune > self.PRUNE_INTERVAL:
+                    last_prune = time.monotonic()
+                    await asyncio.to_thread(self._prune)
+            except sqlite3.Error as e:
+                logger.error(f"Error writing log store: {e}")
 
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self.flush()
+            self._conn.close()
+            self._conn = None
 
-        message = "📊 **Node Status:**\n\n"
-        message += f"**System Services:**\n"
-        message += f"• `{STORY_SERVICE}`: `{story_status}`\n"
-        message += f"• `{STORY_GETH_SERVICE}`: `{story_geth_status}`\n\n"
 
-        message += "**Node Status:**\n"
-        message += f"• Node ID: `{node_info.get('id', 'N/A')}`\n"
-        message += f"• Listen Address: `{node_info.get('listen_addr', 'N/A')}`\n"
-        message += f"• Network: `{node_info.get('network', 'N/A')}`\n"
-        message += f"• Version: `{node_info.get('version', 'N/A')}`\n\n"
+log_store = LogStore(LOG_DB_PATH, LOG_RETENTION_DAYS, LOG_DB_MAX_MB)
+journal_followers = {}
 
-        message += "**Synchronization Info:**\n"
-        message += f"• Latest Block Height: `{sync_info.get('latest_block_height', 'N/A')}`\n"
-        message += f"• Latest Block Time: `{sync_info.get('latest_block_time', 'N/A')}`\n"
-        message += f"• Catching Up: `{sync_info.get('catching_up', False)}`\n\n"
 
-        message += "**Validator Info:**\n"
-        message += f"• Address: `{validator_info.get('address', 'N/A')}`\n"
-        message += f"• Voting Power: `{validator_info.get('voting_power', 'N/A')}`\n"
-        message += f"• Proposer Priority: `{validator_info.get('proposer_priority', 'N/A')}`\n\n"
+async def start_journal_followers() -> None:
+    try:
+        await log_store.open()
+        start_background(log_store.run())
+        sink = log_store.append
+    except sqlite3.Error as e:
+        logger.error(f"Log store disabled, could not open {LOG_DB_PATH}: {e}")
+        sink = None
+    for service in (STORY_SERVICE, STORY_GETH_SERVICE):
+        if service and service not in journal_followers:
+            follower = JournalFollower(service, sink=sink)
+            state_store.attach(f"journal_cursor:{service}", follower.restore, follower.dump)
+            journal_followers[service] = follower
+            start_background(follower.run())
 
 
-        message += block_message
+TIME_SPEC_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
 
-        keyboard = [
-            [InlineKeyboardButton("Back to Main Menu", callback_data="start")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
 
+def parse_time_spec(value: str) -> int:
+    # "90m", "6h", "2d" are relative to now; anything else must be an ISO
+    # date/time such as "2024-10-20T02:00". Returns microseconds since the epoch.
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhd])", value)
+    if match:
+        return int((time.time() - float(match.group(1)) * TIME_SPEC_UNITS[match.group(2)]) * 1e6)
+    try:
+        return int(datetime.fromisoformat(value).timestamp() * 1e6)
+    except ValueError:
+        raise Exception(f"Invalid time '{value}', use e.g. 30m, 6h, 2d or 2024-10-20T02:00")
 
-        if len(message) <= 4096:
-            await update.callback_query.edit_message_text(
-                message, reply_markup=reply_markup, parse_mode='Markdown'
-            )
+
+@admin_only
+@instrumented
+async def search_logs(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    options = {"service": None, "level": None, "since": "1d", "until": None}
+    terms = []
+    for arg in context.args:
+        key, sep, value = arg.partition("=")
+        if sep and key in options:
+            options[key] = value
         else:
-            messages = split_message(message)
-            for idx, msg in enumerate(messages):
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text=msg,
-                    reply_markup=reply_markup if idx == 0 else None,
-                    parse_mode='Markdown'
-                )
+            terms.append(arg)
 
-        await update.callback_query.answer()
-    except Exception as e:
-        await update.callback_query.message.reply_text(f"❌ Error fetching status: {str(e)}")
-        await update.callback_query.answer()
+    if not terms and options["level"] is None:
+        await update.message.reply_text(
+            "Usage: /search <keywords> [level=ERROR|WARNING|INFO] [service=story] [since=6h] [until=1h]"
+        )
+        return
 
-async def system_info(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     try:
-        cpu_percent = psutil.cpu_percent()
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-    
-        message = "💻 System Information:\n\n"
-
+        level = options["level"].upper() if options["level"] else None
+        if level is not None and level not in LOG_LEVELS:
+            raise Exception(f"Unknown level '{level}'")
+        since = parse_time_spec(options["since"])
+        until = parse_time_spec(options["until"]) if options["until"] else None
 
+        started = time.monotonic()
+        rows = await log_store.search(" ".join(terms), options["service"], level, since, until)
+        elapsed_ms = (time.monotonic() - started) * 1000
 
-        message += f"CPU Usage: {cpu_percent}%\n"
-        message += f"Memory Usage: {memory.percent}%\n"
-        message += f"Disk Usage: {disk.percent}%\n"
-    
-        keyboard = [[InlineKeyboardButton("Back to Main Menu", callback_data="start")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await update.callback_query.edit_message_text(message, reply_markup=reply_markup)
+        lines = [f"[{service}] {level} {format_log_line(ts, message)[:300]}" for ts, service, level, message in reversed(rows)]
+        header = f"🔎 {len(rows)} match(es) in {elapsed_ms:.0f} ms" + (f" (showing latest {LOG_SEARCH_LIMIT})" if len(rows) == LOG_SEARCH_LIMIT else "")
+        body = "\n".join(lines)
+        if len(header) + len(body) + 2 <= 4000:
+            await update.message.reply_text(f"{header}\n\n{body}" if body else header)
+        else:
+            await update.message.reply_document(document=body.encode(), filename="search_results.txt", caption=header)
     except Exception as e:
-        await update.callback_query.edit_message_text(f"❌ Error fetching system information: {str(e)}")
-
-async def toggle_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    chat_id = update.effective_chat.id
-    if 'monitoring' not in context.chat_data:
-        context.chat_data['monitoring'] = False
-
-    context.chat_data['monitoring'] = not context.chat_data['monitoring']
-    
-    if context.chat_data['monitoring']:
-        message = f"🔍 Continuous monitoring enabled. You'll receive updates every {MONITORING_INTERVAL // 60} minutes."
-        context.job_queue.run_repeating(send_monitoring_update, interval=MONITORING_INTERVAL, first=5, chat_id=chat_id, name=f"monitor_{chat_id}")
-    else:
-        message = "🔍 Continuous monitoring disabled."
-        current_jobs = context.job_queue.get_jobs_by_name(f"monitor_{chat_id}")
-        for job in current_jobs:
-            job.schedule_removal()
+        await update.message.reply_text(f"❌ Error searching logs: {str(e)}")
 
-    keyboard = [[InlineKeyboardButton("Back to Main Menu", callback_data="start")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    await update.callback_query.edit_message_text(message, reply_markup=reply_markup)
 
+async def fetch_and_save_logs(service: str, lines: int = 100) -> str:
+    with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.log') as temp_file, latency.timed("exec journalctl -u"):
+        process = await asyncio.create_subprocess_exec(
+            "journalctl", "-u", service, "-n", str(lines), "--no-pager",
+            stdout=temp_file,
+            stderr=asyncio.subprocess.PIPE
+        )
+        await process.communicate()
+        return temp_file.name
+
+
+EXPORT_READ_BLOCK = 256 * 1024
+exporting = set()
+
+
+def make_compressor(codec: str):
+    if codec == "zst":
+        if zstandard is None:
+            raise Exception("zstd export needs the zstandard package (pip3 install zstandard)")
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    if codec == "gz":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    raise Exception(f"Unknown export format '{codec}', use gz or zst")
+
+
+class LogExportEncoder:
+    # Runs on a worker thread, one block at a time: applies the level filter
+    # (journal JSON lines, exact level as in /search and the Logs view) and
+    # feeds the compressor. Every part is closed as a
+    # complete .gz/.zst file, so each upload can be decompressed on its own.
+    def __init__(self, codec: str, level: str = None):
+        self.codec = codec
+        self.level = level
+        self.compressor = make_compressor(codec)
+        self.carry = b""
+        self.lines = 0
+        self.raw_bytes = 0
+
+    def _filter(self, data: bytes) -> bytes:
+        out = []
+        for raw in data.split(b"\n"):
+            if not raw:
+                continue
+            try:
+                _, timestamp, level, message = parse_journal_entry(raw)
+            except (ValueError, TypeError):
+                continue
+            if level == self.level:
+                out.append(f"{format_log_line(timestamp, message)} [{level}]")
+        return ("\n".join(out) + "\n").encode() if out else b""
+
+    def encode(self, block: bytes, final: bool = False) -> bytes:
+        if self.level is not None:
+            data = self.carry + block
+            cut = len(data) if final else data.rfind(b"\n") + 1
+            self.carry = data[cut:]
+            block = self._filter(data[:cut])
+        self.lines += block.count(b"\n")
+        self.raw_bytes += len(block)
+        return self.compressor.compress(block)
+
+    def end_part(self) -> bytes:
+        tail = self.compressor.flush()
+        self.compressor = make_compressor(self.codec)
+        return tail
+
+    def close(self) -> bytes:
+        return self.encode(b"", final=True) + self.compressor.flush()
+
+
+async def stream_log_export(service: str, since_us: int, until_us: int, level: str, codec: str, upload) -> dict:
+    # journalctl -> filter/compress (worker thread) -> part buffer -> upload.
+    # Reading pauses while a part uploads, so journalctl blocks on the pipe and
+    # memory stays around one part, whatever the size of the window.
+    args = ["journalctl", "-u", service, "--no-pager", f"--since=@{since_us // 1_000_000}"]
+    if until_us:
+        args.append(f"--until=@{until_us // 1_000_000}")
+    args += ["-o", "json", "--output-fields=MESSAGE,PRIORITY"] if level else ["-o", "short-iso"]
+    encoder = LogExportEncoder(codec, level)
+    limit = int(EXPORT_CHUNK_MB * 1024 * 1024) - 4 * EXPORT_READ_BLOCK
+    started = time.monotonic()
+    parts, part, part_size, part_lines, compressed = 0, [], 0, 0, 0
+
+    async def flush(tail: bytes) -> None:
+        nonlocal parts, part, part_size, part_lines, compressed
+        part.append(tail)
+        data = b"".join(part)
+        part, part_size = [], 0
+        parts += 1
+        compressed += len(data)
+        await upload(data, parts, encoder.lines - part_lines)
+        part_lines = encoder.lines
+
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        with latency.timed(f"export {service}"):
+            while True:
+                block = await process.stdout.read(EXPORT_READ_BLOCK)
+                if not block:
+                    break
+                chunk = await asyncio.to_thread(encoder.encode, block)
+                part.append(chunk)
+                part_size += len(chunk)
+                if part_size >= limit:
+                    await flush(encoder.end_part())
+            tail = await asyncio.to_thread(encoder.close)
+            if encoder.lines > part_lines or parts == 0 and encoder.lines:
+                await flush(tail)
+            returncode = await process.wait()
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    if returncode != 0:
+        raise Exception(f"journalctl exited with code {returncode}")
+    return {
+        "lines": encoder.lines,
+        "raw_bytes": encoder.raw_bytes,
+        "compressed_bytes": compressed,
+        "parts": parts,
+        "elapsed": time.monotonic() - started,
+    }
+
+
+def start_log_export(bot, chat_id: int, service: str, since_us: int, until_us: int = None,
+                     level: str = None, codec: str = EXPORT_CODEC) -> bool:
+    # An export can take many minutes (each part may upload for up to
+    # EXPORT_UPLOAD_TIMEOUT), so it runs as a background task and reports
+    # through the outbound queue instead of holding up every other update.
+    # One export runs at a time; returns False when one is already running.
+    if exporting:
+        return False
+    exporting.add(service)
+    start_background(run_log_export(bot, chat_id, service, since_us, until_us, level, codec))
+    return True
+
+
+async def run_log_export(bot, chat_id: int, service: str, since_us: int, until_us: int = None,
+                         level: str = None, codec: str = EXPORT_CODEC) -> None:
+    window = (
+        f"{datetime.fromtimestamp(since_us / 1e6):%Y-%m-%d %H:%M} → "
+        f"{datetime.fromtimestamp((until_us or time.time() * 1e6) / 1e6):%Y-%m-%d %H:%M}"
+    )
+    stamp = f"{datetime.fromtimestamp(since_us / 1e6):%Y%m%d-%H%M}"
+
+    async def upload(data: bytes, index: int, lines: int) -> None:
+        await bot.send_document(
+            chat_id=chat_id,
+            document=data,
+            filename=f"{service}_{stamp}_{(level or 'all').lower()}_part{index}.log.{codec}",
+            caption=f"{service} logs {window}, part {index} ({lines} lines)",
+            write_timeout=EXPORT_UPLOAD_TIMEOUT,
+            read_timeout=EXPORT_UPLOAD_TIMEOUT,
+        )
+
+    try:
+        result = await stream_log_export(service, since_us, until_us, level, codec, upload)
+        if not result["lines"]:
+            message = f"📭 No {level or ''} log entries for {service} in {window}.".replace("  ", " ")
+        else:
+            ratio = result["raw_bytes"] / result["compressed_bytes"] if result["compressed_bytes"] else 0
+            message = (
+                f"📦 Exported {result['lines']} lines of {service} logs ({window}) in {result['parts']} part(s): "
+                f"{format_bytes(result['raw_bytes'])} → {format_bytes(result['compressed_bytes'])} "
+                f"({ratio:.1f}x) in {format_duration(result['elapsed'])}"
+            )
+    except Exception as e:
+        logger.warning(f"Log export for {service} failed: {e}")
+        message = f"❌ Error exporting logs for {service}: {str(e)}"
+    finally:
+        exporting.discard(service)
+    outbound.send(chat_id, message, OutboundQueue.INTERACTIVE)
+
+
+EXPORT_BUSY = "⏳ Another log export is still running, try again when it has finished."
+
+
+@admin_only
+@instrumented
+async def export_logs(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    options = {"service": STORY_SERVICE, "level": None, "since": "1h", "until": None, "format": EXPORT_CODEC}
+    for arg in context.args:
+        key, sep, value = arg.partition("=")
+        if sep and key in options:
+            options[key] = value
+        elif not sep:
+            options["service"] = arg
+
+    services = [s for s in (STORY_SERVICE, STORY_GETH_SERVICE) if s]
+    if options["service"] not in services:
+        await update.message.reply_text(
+            f"Usage: /export <{'|'.join(services)}> [since=2h] [until=30m] [level=ERROR|WARNING|INFO] [format=gz|zst]"
+        )
+        return
+
+    try:
+        level = options["level"].upper() if options["level"] else None
+        if level is not None and level not in LOG_LEVELS:
+            raise Exception(f"Unknown level '{level}'")
+        since = parse_time_spec(options["since"])
+        until = parse_time_spec(options["until"]) if options["until"] else None
+        make_compressor(options["format"])
+        if start_log_export(context.bot, update.effective_chat.id, options["service"],
+                            since, until, level, options["format"]):
+            await update.message.reply_text(f"📤 Exporting {options['service']} logs, the files and a summary will follow...")
+        else:
+            await update.message.reply_text(EXPORT_BUSY)
+    except Exception as e:
+        await update.message.reply_text(f"❌ Error exporting logs: {str(e)}")
+
+
+@instrumented
+async def export_logs_button(update: Update, context: ContextTypes.DEFAULT_TYPE, service: str, hours: int) -> None:
+    query = update.callback_query
+    since = int((time.time() - hours * 3600) * 1e6)
+    if start_log_export(context.bot, update.effective_chat.id, service, since):
+        await query.message.reply_text(f"📤 Exporting the last {hours}h of {service} logs, the files and a summary will follow...")
+    else:
+        await query.message.reply_text(EXPORT_BUSY)
+
+
+def split_message(message: str, max_length: int = 4000) -> list:
+    # Walks the string with an offset instead of re-slicing the remainder, so
+    # splitting is linear in the message length.
+    parts = []
+    start = 0
+    while len(message) - start > max_length:
+        split_index = message.rfind('\n', start, start + max_length)
+        if split_index <= start:
+            split_index = start + max_length
+        parts.append(message[start:split_index])
+        start = split_index
+    parts.append(message[start:])
+    return parts
+
+
+class OutboundQueue:
+    # Every bot-initiated message goes through here. Chats are served in
+    # priority order (alerts first), each chat at most once per
+    # TELEGRAM_CHAT_INTERVAL and all chats together at TELEGRAM_GLOBAL_RATE.
+    # Consecutive queued messages for a chat are merged while they fit in one
+    # Telegram message, and RetryAfter pauses the chat instead of dropping.
+    ALERT, INTERACTIVE, REPORT = 0, 1, 2
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, global_rate: float, chat_interval: float, max_pending: int):
+        self.global_interval = 1.0 / global_rate
+        self.chat_interval = chat_interval
+        self.max_pending = max_pending
+        self.bot = None
+        self.pending = {}
+        self.next_allowed = {}
+        self.busy = set()
+        self.sent = self.merged = self.dropped = self.retried = 0
+        self._seq = itertools.count()
+        self._next_global = 0.0
+        self._wakeup = asyncio.Event()
+
+    def send(self, chat_id: int, text: str, priority: int = REPORT, parse_mode: str = None, reply_markup=None) -> None:
+        items = self.pending.setdefault(chat_id, [])
+        parts = split_message(text, TELEGRAM_MESSAGE_LIMIT)
+        for idx, part in enumerate(parts):
+            items.append({
+                "seq": next(self._seq),
+                "priority": priority,
+                "text": part,
+                "parse_mode": parse_mode,
+                "reply_markup": reply_markup if idx == len(parts) - 1 else None,
+                "attempts": 0,
+            })
+        items.sort(key=lambda item: (item["priority"], item["seq"]))
+        # Under a burst, shed the oldest of the least important messages first.
+        while len(items) > self.max_pending:
+            items.remove(max(items, key=lambda item: (item["priority"], -item["seq"])))
+            self.dropped += 1
+        self._wakeup.set()
+
+    def _pick(self, now: float) -> int:
+        best = None
+        for chat_id, items in self.pending.items():
+            if chat_id in self.busy or self.next_allowed.get(chat_id, 0.0) > now:
+                continue
+            key = (items[0]["priority"], items[0]["seq"])
+            if best is None or key < best[0]:
+                best = (key, chat_id)
+        return None if best is None else best[1]
+
+    def _take(self, chat_id: int) -> dict:
+        items = self.pending[chat_id]
+        item = items.pop(0)
+        while (items and item["reply_markup"] is None and items[0]["parse_mode"] == item["parse_mode"]
+               and len(item["text"]) + 2 + len(items[0]["text"]) <= TELEGRAM_MESSAGE_LIMIT):
+            following = items.pop(0)
+            item = {**following, "text": f"{item['text']}\n\n{following['text']}",
+                    "priority": min(item["priority"], following["priority"])}
+            self.merged += 1
+        if not items:
+            del self.pending[chat_id]
+        return item
+
+    def _requeue(self, chat_id: int, item: dict) -> None:
+        self.pending.setdefault(chat_id, []).insert(0, item)
+
+    async def _deliver(self, chat_id: int, item: dict) -> None:
+        try:
+            with latency.timed("telegram send_message"):
+                await self.bot.send_message(
+                    chat_id=chat_id,
+                    text=item["text"],
+                    parse_mode=item["parse_mode"],
+                    reply_markup=item["reply_markup"]
+                )
+            self.sent += 1
+        except RetryAfter as e:
+            retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else e.retry_after
+            logger.warning(f"Flood limit for chat {chat_id}, retrying in {retry_after}s")
+            self.next_allowed[chat_id] = time.monotonic() + retry_after
+            self.retried += 1
+            self._requeue(chat_id, item)
+        except Forbidden as e:
+            logger.warning(f"Chat {chat_id} blocked the bot, unsubscribing: {e}")
+            self.dropped += 1 + len(self.pending.pop(chat_id, []))
+            monitoring_hub.unsubscribe(chat_id)
+        except BadRequest as e:
+            if item["parse_mode"] and "parse entities" in str(e):
+                # Fall back to plain text rather than losing the message.
+                self._requeue(chat_id, {**item, "parse_mode": None})
+            else:
+                logger.error(f"Dropping message for chat {chat_id}: {e}")
+                self.dropped += 1
+        except NetworkError as e:
+            item["attempts"] += 1
+            if item["attempts"] < self.MAX_ATTEMPTS:
+                self.retried += 1
+                self._requeue(chat_id, item)
+            else:
+                logger.error(f"Dropping message for chat {chat_id} after {item['attempts']} attempts: {e}")
+                self.dropped += 1
+        except Exception as e:
+            logger.error(f"Dropping message for chat {chat_id}: {e}")
+            self.dropped += 1
+        finally:
+            self.busy.discard(chat_id)
+            self._wakeup.set()
+
+    async def run(self, bot) -> None:
+        self.bot = bot
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            if now < self._next_global:
+                await asyncio.sleep(self._next_global - now)
+                continue
+            chat_id = self._pick(now)
+            if chat_id is None:
+                waits = [self.next_allowed.get(c, 0.0) - now for c in self.pending if c not in self.busy]
+                await wait_event(self._wakeup, max(0.01, min(waits)) if waits else None)
+                continue
+            item = self._take(chat_id)
+            self._next_global = now + self.global_interval
+            self.next_allowed[chat_id] = now + self.chat_interval
+            self.busy.add(chat_id)
+            start_background(self._deliver(chat_id, item))
+
+
+outbound = OutboundQueue(TELEGRAM_GLOBAL_RATE, TELEGRAM_CHAT_INTERVAL, OUTBOUND_MAX_PENDING)
+
+
+@instrumented
+async def show_log_filter_options(update: Update, context: ContextTypes.DEFAULT_TYPE, service: str):
+    follower = journal_followers.get(service)
+
+    def label(text: str, level: str = None) -> str:
+        if follower is None:
+            return text
+        count = len(follower.lines if level is None else follower.buckets[level])
+        return f"{text} ({count})"
+
+    keyboard = [
+        [InlineKeyboardButton(label("All Levels"), callback_data=f"log_filter_{service}_all")],
+        [InlineKeyboardButton(label("ERROR", "ERROR"), callback_data=f"log_filter_{service}_ERROR")],
+        [InlineKeyboardButton(label("WARNING", "WARNING"), callback_data=f"log_filter_{service}_WARNING")],
+        [InlineKeyboardButton(label("INFO", "INFO"), callback_data=f"log_filter_{service}_INFO")],
+        [
+            InlineKeyboardButton(f"📦 Export {hours}h", callback_data=f"log_export_{service}_{hours}")
+            for hours in (1, 6, 24)
+        ],
+        [InlineKeyboardButton("Back to Logs Menu", callback_data="logs")],
+        [InlineKeyboardButton("Back to Main Menu", callback_data="start")]
+    ]
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    await update.callback_query.edit_message_text("Select log level to filter:", reply_markup=reply_markup)
+
+async def handle_log_filter(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.callback_query
+    service, level = query.data[len("log_filter_"):].rsplit('_', 1)
+
+    if level == 'all':
+        level = None
+    
+    await view_logs(update, context, service, level)
+
+@instrumented
+async def view_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, service: str, level: str = None):
+    try:
+        follower = journal_followers.get(service)
+        if follower is not None and follower.lines:
+            lines = follower.tail(level)
+            caption = f"Recent {level or 'all'} logs for {service}"
+            await context.bot.send_document(
+                chat_id=update.effective_chat.id,
+                document=("\n".join(lines) or f"No {level} entries in the last {len(follower.lines)} lines.").encode(),
+                filename=f"{service}_{(level or 'all').lower()}_logs.txt",
+                caption=caption
+            )
+        else:
+            temp_file_path = await fetch_and_save_logs(service)
+
+            with open(temp_file_path, 'rb') as log_file:
+                await context.bot.send_document(
+                    chat_id=update.effective_chat.id,
+                    document=log_file,
+                    filename=f"{service}_logs.txt",
+                    caption=f"Recent logs for {service}"
+                )
+
+            os.unlink(temp_file_path)
+
+        keyboard = [
+            [InlineKeyboardButton("Back to Logs Menu", callback_data="logs")],
+            [InlineKeyboardButton("Back to Main Menu", callback_data="start")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        await update.callback_query.message.reply_text(
+            f"Logs for {service} have been sent as a file. Use the buttons below for more options:",
+            reply_markup=reply_markup
+        )
+
+        await update.callback_query.answer()
+    except Exception as e:
+        await update.callback_query.message.reply_text(f"❌ Error fetching logs for {service}: {str(e)}")
+        await update.callback_query.answer()
+
+
+restarting = set()
+
+
+@instrumented
+async def restart_service(update: Update, context: ContextTypes.DEFAULT_TYPE, service_name: str) -> None:
+    # systemctl can take up to RESTART_TIMEOUT; the restart runs as a background
+    # task and edits this message when it is done, so other chats stay responsive.
+    if service_name in restarting:
+        await update.callback_query.edit_message_text(
+            f"⏳ {service_name} is already being restarted.",
+            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("Back to Main Menu", callback_data="start")]])
+        )
+        return
+    restarting.add(service_name)
+    await update.callback_query.edit_message_text(f"🔄 Restarting {service_name}...")
+    message = update.callback_query.message
+    start_background(finish_restart(context.bot, message.chat_id, message.message_id, service_name))
+
+
+async def finish_restart(bot, chat_id: int, message_id: int, service_name: str) -> None:
+    try:
+        returncode, _, stderr = await run_command("sudo", "systemctl", "restart", service_name, timeout=RESTART_TIMEOUT)
+        if returncode != 0:
+            raise Exception(stderr.strip() or f"systemctl restart exited with code {returncode}")
+        text = f"✅ {service_name} service restarted successfully."
+    except Exception as e:
+        text = f"❌ Error restarting {service_name} service: {str(e)}"
+    finally:
+        restarting.discard(service_name)
+    snapshots.invalidate("services")
+
+    keyboard = [[InlineKeyboardButton("Back to Main Menu", callback_data="start")]]
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    try:
+        await bot.edit_message_text(text, chat_id=chat_id, message_id=message_id, reply_markup=reply_markup)
+    except Exception as e:
+        # The progress message may have been replaced by another view in the meantime.
+        logger.warning(f"Could not update restart message for {service_name}: {e}")
+        outbound.send(chat_id, text, OutboundQueue.INTERACTIVE, None, reply_markup)
+
+async def fetch_node_status() -> dict:
+    return await rpc_client.get_json(f"{NODE_RPC_URL}/status")
+
+
+async def get_node_status() -> dict:
+    return await snapshots.get("status", fetch_node_status)
+
+
+class ValidatorSetCache:
+    # Full validator sets keyed by the header's validators_hash, plus a
+    # height -> hash index, so a height is never fetched twice and an unchanged
+    # set costs only the (cached) /commit lookup. All pages of a new set are
+    # requested concurrently, sized from the previous set's page count; pages
+    # past the end of a set that shrank come back as errors and are dropped.
+    PER_PAGE = 100
+    KEEP = 4
+    HEIGHTS = 256
+
+    def __init__(self):
+        self.sets = {}
+        self.heights = {}
+        self.current = None
+        self.previous = None
+        self.changes = None
+        self.header = None
+
+    def note_header(self, height: int, validators_hash: str) -> None:
+        self.header = (height, validators_hash, time.monotonic())
+
+    async def _latest_header(self) -> Tuple[int, str]:
+        if self.header is not None and time.monotonic() - self.header[2] < SNAPSHOT_TTL:
+            return self.header[0], self.header[1]
+        commit = await snapshots.get("commit", lambda: rpc_client.get_json(f"{NODE_RPC_URL}/commit"))
+        header = commit['result']['signed_header']['header']
+        return int(header['height']), header['validators_hash']
+
+    async def _fetch_page(self, height: int, page: int) -> dict:
+        data = await rpc_client.get_json(
+            f"{NODE_RPC_URL}/validators",
+            params={"height": str(height), "page": str(page), "per_page": str(self.PER_PAGE)}
+        )
+        if 'result' not in data:
+            raise Exception(f"validators page {page} at height {height}: {data.get('error')}")
+        return data['result']
+
+    async def _fetch(self, height: int, validators_hash: str) -> dict:
+        guess = 1 if self.current is None else max(1, -(-len(self.current["validators"]) // self.PER_PAGE))
+        pages = await asyncio.gather(*(self._fetch_page(height, p) for p in range(1, guess + 1)), return_exceptions=True)
+        if isinstance(pages[0], BaseException):
+            raise pages[0]
+        needed = -(-int(pages[0]['total']) // self.PER_PAGE)
+        pages = pages[:needed]
+        for page in pages:
+            if isinstance(page, BaseException):
+                raise page
+        if needed > guess:
+            pages += await asyncio.gather(*(self._fetch_page(height, p) for p in range(guess + 1, needed + 1)))
+        validators = [
+            {
+                "address": v['address'].upper(),
+                "voting_power": int(v['voting_power']),
+                "proposer_priority": int(v['proposer_priority']),
+            }
+            for page in pages for v in page['validators']
+        ]
+        validators.sort(key=lambda v: (-v["voting_power"], v["address"]))
+        logger.info(f"Fetched {len(validators)} validators at height {height} in {len(pages)} pages")
+        return {
+            "height": height,
+            "hash": validators_hash,
+            "validators": validators,
+            "total_power": sum(v["voting_power"] for v in validators),
+            "index": {v["address"]: rank for rank, v in enumerate(validators, 1)},
+        }
+
+    async def at(self, height: int, validators_hash: str = None) -> dict:
+        validators_hash = validators_hash or self.heights.get(height) or f"height:{height}"
+        entry = self.sets.get(validators_hash)
+        if entry is None:
+            entry = await snapshots.get(
+                f"validators:{validators_hash}", lambda: self._fetch(height, validators_hash), float("inf")
+            )
+            snapshots.invalidate(f"validators:{validators_hash}")
+            self.sets[validators_hash] = entry
+            while len(self.sets) > self.KEEP:
+                self.sets.pop(next(iter(self.sets)))
+        self.heights[height] = validators_hash
+        while len(self.heights) > self.HEIGHTS:
+            self.heights.pop(next(iter(self.heights)))
+        if self.current is None or (entry is not self.current and height >= self.current["height"]):
+            self.previous, self.current = self.current, entry
+            self.changes = None if self.previous is None else diff_validator_sets(self.previous, entry)
+        return entry
+
+    async def latest(self) -> dict:
+        return await self.at(*await self._latest_header())
+
+
+def diff_validator_sets(old: dict, new: dict) -> dict:
+    old_power = {v["address"]: v["voting_power"] for v in old["validators"]}
+    new_power = {v["address"]: v["voting_power"] for v in new["validators"]}
+    return {
+        "since": old["height"],
+        "joined": [a for a in new_power if a not in old_power],
+        "left": [a for a in old_power if a not in new_power],
+        "power": {a: new_power[a] - old_power[a] for a in new_power
+                  if a in old_power and new_power[a] != old_power[a]},
+    }
+
+
+def format_validator_ranking(entry: dict, address: str, changes: dict = None) -> str:
+    validators = entry["validators"]
+    message = f"Validator Set (height {entry['height']}, {len(validators)} validators):\n"
+    if not validators:
+        return message
+    address = (address or "").upper()
+    cutoff = validators[-1]["voting_power"]
+    rank = entry["index"].get(address)
+    if rank is None:
+        message += "  Rank: not in the active set\n"
+        message += f"  Lowest Active Power: {cutoff}\n"
+    else:
+        power = validators[rank - 1]["voting_power"]
+        share = 100.0 * power / entry["total_power"] if entry["total_power"] else 0.0
+        message += f"  Rank: {rank} / {len(validators)}\n"
+        message += f"  Voting Power Share: {share:.3f}%\n"
+        message += f"  Margin Above Cutoff: {power - cutoff} (lowest active power {cutoff})\n"
+        if rank > 1:
+            message += f"  Power Needed For Next Rank: {validators[rank - 2]['voting_power'] - power + 1}\n"
+    if changes is not None:
+        message += (
+            f"  Changes Since Height {changes['since']}: {len(changes['joined'])} joined, "
+            f"{len(changes['left'])} left, {len(changes['power'])} power changes\n"
+        )
+        if address in changes["power"]:
+            message += f"  Our Power Change: {changes['power'][address]:+d}\n"
+    return message
+
+
+validator_sets = ValidatorSetCache()
+
+
+async def get_net_info(ttl: float = None) -> dict:
+    return await snapshots.get("net_info", lambda: rpc_client.get_json(f"{NODE_RPC_URL}/net_info"), ttl)
+
+
+class PeerTracker:
+    # Keyed index (node id -> peer) of the node's /net_info peers. Each sample
+    # is applied as a diff: unknown ids are added, missing ones removed and the
+    # rest updated in place, so joins and leaves fall out of the update and
+    # nothing is rebuilt however many peers there are.
+    RECENT = 10
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.peers = {}
+        self.events = deque()
+        self.recent = deque(maxlen=self.RECENT)
+        self.joined_total = 0
+        self.left_total = 0
+        self.last_diff = None
+        self.started_at = None
+        self.sampled_at = None
+
+    @staticmethod
+    def _parse(peer: dict) -> Tuple[str, dict]:
+        info = peer.get('node_info') or {}
+        status = peer.get('connection_status') or {}
+        return info.get('id'), {
+            "moniker": info.get('moniker') or "?",
+            "ip": peer.get('remote_ip') or "?",
+            "outbound": bool(peer.get('is_outbound')),
+            "send_rate": int(safe_get(status, 'SendMonitor', 'AvgRate', default=0) or 0),
+            "recv_rate": int(safe_get(status, 'RecvMonitor', 'AvgRate', default=0) or 0),
+            "duration": int(status.get('Duration') or 0) / 1e9,
+        }
+
+    def apply(self, net_info: dict, now: float = None) -> dict:
+        now = now if now is not None else time.time()
+        initial = self.sampled_at is None
+        seen, joined = set(), []
+        for peer in safe_get(net_info, 'result', 'peers', default=[]) or []:
+            node_id, fields = self._parse(peer)
+            if not node_id:
+                continue
+            seen.add(node_id)
+            entry = self.peers.get(node_id)
+            if entry is None:
+                self.peers[node_id] = fields
+                joined.append(node_id)
+            else:
+                entry.update(fields)
+        left = [(node_id, self.peers.pop(node_id)) for node_id in list(self.peers) if node_id not in seen]
+
+        self.sampled_at = now
+        if initial:
+            # The first sample is the existing peer set, not churn.
+            self.started_at = now
+            return {"joined": [], "left": []}
+        for node_id in joined:
+            self.recent.append((now, "+", self.peers[node_id]["moniker"], self.peers[node_id]["ip"]))
+        for _, peer in left:
+            self.recent.append((now, "-", peer["moniker"], peer["ip"]))
+        self.joined_total += len(joined)
+        self.left_total += len(left)
+        self.events.append((now, len(joined), len(left)))
+        while self.events and self.events[0][0] < now - PEER_CHURN_WINDOW:
+            self.events.popleft()
+        self.last_diff = {"joined": joined, "left": [node_id for node_id, _ in left]}
+        return self.last_diff
+
+    async def run(self) -> None:
+        while True:
+            try:
+                self.apply(await get_net_info(self.interval))
+            except Exception as e:
+                logger.warning(f"Error sampling peers: {e}")
+            await asyncio.sleep(self.interval)
+
+    def churn(self) -> Tuple[int, int, float]:
+        # Joins and leaves within PEER_CHURN_WINDOW, and their sum per hour.
+        if self.started_at is None:
+            return 0, 0, None
+        joined = sum(event[1] for event in self.events)
+        left = sum(event[2] for event in self.events)
+        span = min(PEER_CHURN_WINDOW, self.sampled_at - self.started_at)
+        return joined, left, (joined + left) * 3600 / span if span > 0 else None
+
+    def ranked(self, count: int = 5) -> Tuple[list, list]:
+        throughput = lambda item: item[1]["send_rate"] + item[1]["recv_rate"]
+        return (heapq.nlargest(count, self.peers.items(), key=throughput),
+                heapq.nsmallest(count, self.peers.items(), key=throughput))
+
+    def format(self) -> str:
+        if self.sampled_at is None:
+            return "👥 Peers: collecting...\n"
+        outbound = sum(1 for peer in self.peers.values() if peer["outbound"])
+        message = f"👥 Peers: {len(self.peers)} ({outbound} out, {len(self.peers) - outbound} in)"
+        message += " ⚠️ low\n" if len(self.peers) < ALERT_MIN_PEERS else "\n"
+        if self.last_diff is not None:
+            message += f"Last Sample: +{len(self.last_diff['joined'])} joined, -{len(self.last_diff['left'])} left\n"
+        joined, left, rate = self.churn()
+        if rate is not None:
+            message += (
+                f"Churn: {joined} joined, {left} left in the last "
+                f"{format_duration(min(PEER_CHURN_WINDOW, self.sampled_at - self.started_at))} ({rate:.1f}/h)\n"
+            )
+        message += (
+            f"Total: ↑ {format_rate(sum(p['send_rate'] for p in self.peers.values()))} "
+            f"↓ {format_rate(sum(p['recv_rate'] for p in self.peers.values()))}\n"
+        )
+        line = lambda peer: (
+            f"  {peer['moniker'][:24]} ({peer['ip']}, {'out' if peer['outbound'] else 'in'}, "
+            f"{format_duration(peer['duration'])}): ↑ {format_rate(peer['send_rate'])} ↓ {format_rate(peer['recv_rate'])}\n"
+        )
+        best, worst = self.ranked()
+        if best:
+            message += "\n🏆 Best by throughput:\n" + "".join(line(peer) for _, peer in best)
+        if len(self.peers) > len(best):
+            message += "\n🐢 Worst by throughput:\n" + "".join(line(peer) for _, peer in worst)
+        if self.recent:
+            message += "\nRecent Changes:\n"
+            for ts, sign, moniker, ip in reversed(self.recent):
+                message += f"  {datetime.fromtimestamp(ts):%H:%M:%S} {sign} {moniker[:24]} ({ip})\n"
+        return message
+
+
+peer_tracker = PeerTracker(PEER_SAMPLE_INTERVAL)
+
+
+async def get_reference_height() -> int:
+    return await snapshots.get("reference_height", reference_resolver.resolve)
+
+
+def format_duration(seconds: float) -> str:
+    if seconds is None:
+        return "N/A"
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}d {hours}h {minutes}m"
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+async def run_command(*args: str, timeout: float = SYSTEMCTL_TIMEOUT) -> Tuple[int, str, str]:
+    with latency.timed(f"exec {' '.join(args[:2])}") as timer:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise Exception(f"{' '.join(args)} timed out after {timeout:g}s")
+    if process.returncode != 0:
+        latency.ops[timer.name]["errors"] += 1
+    return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+
+SERVICE_PROPERTIES = ["Id", "ActiveState", "SubState", "MainPID", "NRestarts", "ActiveEnterTimestampMonotonic"]
+
+
+def parse_systemctl_show(output: str) -> List[dict]:
+    units, current = [], {}
+    for line in output.splitlines():
+        if not line.strip():
+            if current:
+                units.append(current)
+                current = {}
+            continue
+        key, _, value = line.partition("=")
+        current[key] = value
+    if current:
+        units.append(current)
+    return units
+
+
+async def fetch_service_states() -> dict:
+    # One `systemctl show` for both units instead of an `is-active` per unit.
+    services = [s for s in (STORY_SERVICE, STORY_GETH_SERVICE) if s]
+    returncode, stdout, stderr = await run_command(
+        "systemctl", "show", f"--property={','.join(SERVICE_PROPERTIES)}", *services
+    )
+    if returncode != 0:
+        raise Exception(stderr.strip() or f"systemctl show exited with code {returncode}")
+
+    # ActiveEnterTimestampMonotonic is CLOCK_MONOTONIC in microseconds, the same clock as time.monotonic().
+    now = time.monotonic()
+    states = {}
+    for service, props in zip(services, parse_systemctl_show(stdout)):
+        active_state = props.get("ActiveState") or "unknown"
+        entered = int(props.get("ActiveEnterTimestampMonotonic") or 0)
+        states[service] = {
+            "active_state": active_state,
+            "sub_state": props.get("SubState") or "unknown",
+            "main_pid": int(props.get("MainPID") or 0),
+            "restarts": int(props.get("NRestarts") or 0),
+            "uptime": now - entered / 1e6 if active_state == "active" and entered else None,
+        }
+    return states
+
+
+async def get_service_states() -> dict:
+    return await snapshots.get("services", fetch_service_states)
+
+
+def format_service_states(states: dict) -> str:
+    message = ""
+    for service, state in states.items():
+        message += f"• `{service}`: `{state['active_state']}` ({state['sub_state']})\n"
+        if state['main_pid']:
+            message += f"  PID `{state['main_pid']}`, up {format_duration(state['uptime'])}, restarts `{state['restarts']}`\n"
+    return message
+
+class HeightTracker:
+    # Rolling (timestamp, height) history for our node and for the network,
+    # fed by every /status and reference-height sample we already take.
+    MIN_SPACING = 1.0
+
+    def __init__(self, capacity: int):
+        self.node = RingSeries(capacity)
+        self.network = RingSeries(capacity)
+        self.last_height = None
+        self.last_advance = None
+
+    def record(self, node_height: int = None, network_height: int = None, now: float = None) -> None:
+        now = now if now is not None else time.time()
+        if node_height is not None:
+            if self.last_height is None or node_height > self.last_height:
+                self.last_height = node_height
+                self.last_advance = now
+            if not len(self.node) or now - self.node.latest_time() >= self.MIN_SPACING:
+                self.node.append(now, node_height)
+        if network_height is not None:
+            if not len(self.network) or now - self.network.latest_time() >= self.MIN_SPACING:
+                self.network.append(now, network_height)
+
+    @staticmethod
+    def _rate(series: RingSeries, window: float) -> float:
+        points = series.points(window)
+        if len(points) < 2 or points[-1][0] <= points[0][0]:
+            return None
+        return (points[-1][1] - points[0][1]) / (points[-1][0] - points[0][0])
+
+    def node_rate(self, window: float = HEIGHT_RATE_WINDOW) -> float:
+        return self._rate(self.node, window)
+
+    def network_rate(self, window: float = HEIGHT_RATE_WINDOW) -> float:
+        return self._rate(self.network, window)
+
+    def lag(self) -> int:
+        # The reference height is sampled less often than ours, so it is moved
+        # to the time of our latest sample at the network's block rate before
+        # subtracting; comparing raw samples swings by the blocks in between.
+        if not len(self.node) or not len(self.network):
+            return None
+        network = self.network.latest()
+        rate = self.network_rate()
+        if rate is not None:
+            network += rate * (self.node.latest_time() - self.network.latest_time())
+        return int(round(network - self.node.latest()))
+
+    def stalled_for(self, now: float = None) -> float:
+        if self.last_advance is None:
+            return None
+        return (now if now is not None else time.time()) - self.last_advance
+
+    def catch_up_eta(self) -> float:
+        # None when in sync or when we cannot tell; inf when the gap is not closing.
+        lag = self.lag()
+        node_rate, network_rate = self.node_rate(), self.network_rate()
+        if lag is None or lag <= 0 or node_rate is None or network_rate is None:
+            return None
+        closing = node_rate - network_rate
+        return lag / closing if closing > 0 else float("inf")
+
+    def dump(self) -> dict:
+        return {
+            "node": self.node.dump(),
+            "network": self.network.dump(),
+            "last_height": self.last_height,
+            "last_advance": self.last_advance,
+        }
+
+    def restore(self, data: dict) -> None:
+        self.node.restore(data["node"])
+        self.network.restore(data["network"])
+        self.last_height = data["last_height"]
+        self.last_advance = data["last_advance"]
+
+    def format(self) -> str:
+        node_rate, network_rate = self.node_rate(), self.network_rate()
+        if node_rate is None and network_rate is None:
+            return ""
+        rate = lambda r: "N/A" if r is None else f"{r:.2f}"
+        message = f"Sync Rate: node {rate(node_rate)} blk/s, network {rate(network_rate)} blk/s\n"
+        eta = self.catch_up_eta()
+        if eta == float("inf"):
+            message += "Catch-up ETA: ⚠️ not closing the gap\n"
+        elif eta is not None:
+            message += f"Catch-up ETA: {format_duration(eta)}\n"
+        stalled = self.stalled_for()
+        if stalled is not None and stalled >= HEIGHT_STALL_SECONDS:
+            message += f"🛑 Height has not advanced for {format_duration(stalled)}\n"
+        return message
+
+
+height_tracker = HeightTracker(int(HEIGHT_HISTORY_SECONDS / HEIGHT_SAMPLE_INTERVAL))
+
+
+async def sample_heights() -> None:
+    # Local /status is cheap and drives stall detection; the remote reference
+    # height is refreshed less often and otherwise reused from the snapshot cache.
+    # In websocket mode the node height arrives with every block push instead.
+    last_reference = 0.0
+    while True:
+        try:
+            node_height = None
+            if MONITOR_MODE != "websocket":
+                status = await get_node_status()
+                node_height = int(status['result']['sync_info']['latest_block_height'])
+            network_height = None
+            if time.monotonic() - last_reference >= HEIGHT_REFERENCE_INTERVAL:
+                last_reference = time.monotonic()
+                network_height = await get_reference_height()
+            height_tracker.record(node_height, network_height)
+        except Exception as e:
+            logger.warning(f"Error sampling block heights: {e}")
+        await asyncio.sleep(HEIGHT_SAMPLE_INTERVAL if MONITOR_MODE != "websocket" else HEIGHT_REFERENCE_INTERVAL)
+
+
+class BlockWatcher:
+    # Subscribes to new block headers over the node's /websocket endpoint, so
+    # height and stall state update on every block instead of every poll.
+    def __init__(self, url: str, deadline: float):
+        self.url = url
+        self.deadline = deadline
+        self.connected = False
+        self.last_height = None
+        self.last_block_at = None
+
+    def _handle(self, payload: dict) -> None:
+        data = safe_get(payload, 'result', 'data', default=None)
+        if not isinstance(data, dict):
+            return
+        if data.get('type') == 'tendermint/event/ValidatorSetUpdates':
+            snapshots.invalidate("commit")
+            return
+        height = safe_get(data, 'value', 'header', 'height', default=None)
+        if height is None:
+            return
+        self.last_height = int(height)
+        validators_hash = safe_get(data, 'value', 'header', 'validators_hash', default=None)
+        if validators_hash:
+            validator_sets.note_header(self.last_height, validators_hash)
+        self.last_block_at = time.monotonic()
+        height_tracker.record(self.last_height)
+        alert_engine.dispatch([alert_engine.observe("stall", 0.0)])
+
+    async def _listen(self) -> None:
+        session = await rpc_client.session()
+        async with session.ws_connect(self.url, heartbeat=30, max_msg_size=0) as ws:
+            # NewBlockHeader rather than NewBlock: same height signal without
+            # pushing every block's transactions through the socket.
+            await ws.send_json({"jsonrpc": "2.0", "method": "subscribe", "id": 1,
+                                "params": {"query": "tm.event='NewBlockHeader'"}})
+            if WS_VALIDATOR_UPDATES:
+                await ws.send_json({"jsonrpc": "2.0", "method": "subscribe", "id": 2,
+                                    "params": {"query": "tm.event='ValidatorSetUpdates'"}})
+            self.connected = True
+            logger.info(f"Subscribed to new blocks on {self.url}")
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    try:
+                        self._handle(json.loads(msg.data))
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"Malformed websocket event: {e}")
+                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+
+    async def run(self) -> None:
+        backoff = 1
+        while True:
+            started = time.monotonic()
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Websocket {self.url} failed: {e}")
+            finally:
+                self.connected = False
+            # Reset the backoff once a connection has stayed up for a while.
+            if time.monotonic() - started > 60:
+                backoff = 1
+            await asyncio.sleep(backoff + random.uniform(0, backoff / 2))
+            backoff = min(backoff * 2, 60)
+
+    async def watchdog(self) -> None:
+        # Feeds the stall rule between block pushes, so an alert fires as soon
+        # as the deadline passes rather than on the next alert evaluation.
+        started = time.monotonic()
+        while True:
+            await asyncio.sleep(min(1.0, self.deadline / 4))
+            since = self.last_block_at if self.last_block_at is not None else started
+            alert_engine.dispatch([alert_engine.observe("stall", time.monotonic() - since)])
+
+    def format(self) -> str:
+        if self.last_block_at is None:
+            return f"Block Stream: {'connected' if self.connected else 'disconnected'}, no block yet\n"
+        return (
+            f"Block Stream: {'connected' if self.connected else 'disconnected'}, "
+            f"last block {format_duration(time.monotonic() - self.last_block_at)} ago\n"
+        )
+
+
+block_watcher = BlockWatcher(NODE_WS_URL, BLOCK_DEADLINE)
+
+
+class SigningTracker:
+    # Walks /commit forward from a checkpoint and records, one bit per height
+    # in a ring of `window` bits, whether our validator's signature was
+    # missing. Heights are fetched SIGNING_BATCH at a time in a single JSON-RPC
+    # batch request, one batch in flight, so RPC load stays bounded while
+    # catching up. The ring and counters are persisted for a fast resume.
+    RECENT_MISSES = 10
+    BLOCK_ID_FLAG_ABSENT = 1
+
+    def __init__(self, window: int):
+        self.window = window
+        self._reset(None)
+
+    def _reset(self, address: str) -> None:
+        self.address = address
+        self.bits = bytearray((self.window + 7) // 8)
+        self.first_height = None
+        self.last_height = None
+        self.missed = 0
+        self.streak = 0
+        self.recent = deque(maxlen=self.RECENT_MISSES)
+
+    def restore(self, data: dict) -> None:
+        if data is None or data["window"] != self.window:
+            return
+        try:
+            self.address = data["address"]
+            self.bits = bytearray.fromhex(data["bits"])
+            self.first_height = data["first_height"]
+            self.last_height = data["last_height"]
+            self.missed = data["missed"]
+            self.streak = data["streak"]
+            self.recent.extend(data["recent"])
+        except (ValueError, KeyError, TypeError):
+            self._reset(None)
+            raise
+
+    def dump(self) -> dict:
+        if self.last_height is None:
+            return None
+        return {
+            "window": self.window,
+            "address": self.address,
+            "bits": self.bits.hex(),
+            "first_height": self.first_height,
+            "last_height": self.last_height,
+            "missed": self.missed,
+            "streak": self.streak,
+            "recent": list(self.recent),
+        }
+
+    def record(self, height: int, missed: bool) -> None:
+        slot, mask = divmod(height % self.window, 8)
+        mask = 1 << mask
+        if self.first_height is None:
+            self.first_height = height
+        elif height - self.window >= self.first_height and self.bits[slot] & mask:
+            # The slot still holds height - window, which is leaving the window.
+            self.missed -= 1
+        if missed:
+            self.bits[slot] |= mask
+            self.missed += 1
+            self.streak += 1
+            self.recent.append(height)
+        else:
+            self.bits[slot] &= ~mask
+            self.streak = 0
+        self.last_height = height
+
+    @property
+    def recorded(self) -> int:
+        if self.last_height is None:
+            return 0
+        return min(self.window, self.last_height - self.first_height + 1)
+
+    def uptime(self) -> float:
+        recorded = self.recorded
+        return None if not recorded else 100.0 * (recorded - self.missed) / recorded
+
+    def _missed_in(self, commit: dict) -> bool:
+        for signature in safe_get(commit, 'result', 'signed_header', 'commit', 'signatures', default=[]) or []:
+            if (signature.get('validator_address') or '').upper() == self.address:
+                return signature.get('block_id_flag') == self.BLOCK_ID_FLAG_ABSENT
+        # Absent votes carry no address in recent CometBFT versions.
+        return True
+
+    async def _fetch(self, heights: List[int]) -> List[dict]:
+        payload = [
+            {"jsonrpc": "2.0", "id": height, "method": "commit", "params": {"height": str(height)}}
+            for height in heights
+        ]
+        responses = await rpc_client.post_json(NODE_RPC_URL, payload)
+        if not isinstance(responses, list):
+            raise Exception(f"Unexpected batch response: {str(responses)[:200]}")
+        by_id = {response.get('id'): response for response in responses}
+        results = []
+        for height in heights:
+            response = by_id.get(height)
+            if response is None or 'error' in response:
+                if not results:
+                    raise Exception(f"commit at height {height} unavailable: {(response or {}).get('error')}")
+                break
+            results.append(response)
+        return results
+
+    async def scan(self) -> bool:
+        # Returns True while there are more committed heights to fetch.
+        status = await get_node_status()
+        validator = status['result']['validator_info']
+        address = (validator.get('address') or '').upper()
+        if not address or int(validator.get('voting_power') or 0) == 0:
+            return False
+        if address != self.address:
+            self._reset(address)
+        # The commit for the tip height can still change, so stop one short.
+        tip = int(status['result']['sync_info']['latest_block_height']) - 1
+        if self.last_height is None or tip - self.last_height > self.window:
+            start = max(1, tip - min(SIGNING_BACKFILL, self.window) + 1)
+            if self.last_height is not None:
+                logger.info(f"Signing checkpoint {self.last_height} is too old, resuming at {start}")
+                self._reset(address)
+        else:
+            start = self.last_height + 1
+        if start > tip:
+            return False
+
+        heights = list(range(start, min(tip, start + SIGNING_BATCH - 1) + 1))
+        commits = await self._fetch(heights)
+        messages = []
+        for height, commit in zip(heights, commits):
+            self.record(height, self._missed_in(commit))
+            # Only alert on live data, not while replaying history.
+            if tip - height <= SIGNING_BATCH:
+                messages.append(alert_engine.observe("missed_streak", self.streak))
+        alert_engine.dispatch(messages)
+        if not commits:
+            return False
+        return self.last_height < tip
+
+    async def run(self) -> None:
+        while True:
+            try:
+                behind = await self.scan()
+            except Exception as e:
+                logger.warning(f"Error scanning signed blocks: {e}")
+                behind = False
+            await asyncio.sleep(0 if behind else SIGNING_INTERVAL)
+
+    def format(self) -> str:
+        uptime = self.uptime()
+        if uptime is None:
+            return "Signing: no blocks scanned yet\n"
+        message = (
+            f"Signing (last {self.recorded} blocks):\n"
+            f"  Uptime: {uptime:.2f}%\n"
+            f"  Missed: {self.missed}\n"
+            f"  Current Missed Streak: {self.streak}\n"
+            f"  Scanned Up To: {self.last_height}\n"
+        )
+        if self.recent:
+            message += f"  Recent Misses: {', '.join(str(h) for h in reversed(self.recent))}\n"
+        return message
+
+
+signing_tracker = SigningTracker(SIGNING_WINDOW)
+
+
+async def compare_block_heights() -> Tuple[str, bool]:
+    try:
+        latest_block_rpc1, node_status = await asyncio.gather(
+            get_reference_height(),
+            get_node_status(),
+        )
+        node_block_height = int(node_status['result']['sync_info']['latest_block_height'])
+        logger.info(f"Node's current block height: {node_block_height}")
+        height_tracker.record(node_block_height, latest_block_rpc1)
+        sync_rates = height_tracker.format()
+        if MONITOR_MODE == "websocket":
+            sync_rates += block_watcher.format()
+
+
+        if node_block_height < latest_block_rpc1:
+            difference = latest_block_rpc1 - node_block_height
+            message = (
+                f"🚨 **Block Synchronization Alert:**\n\n"
+                f"Your node is behind by {difference} blocks.\n"
+                f"Node Block Height: {node_block_height}\n"
+                f"Network Latest Block: {latest_block_rpc1}\n"
+                f"{sync_rates}\n"
+                f"🔍 Please check your node to ensure it's operating correctly."
+            )
+            return message, False
+        else:
+            message = (
+                f"✅ **Block Synchronization Status:**\n\n"
+                f"Your node is fully synchronized.\n"
+                f"Node Block Height: {node_block_height}\n"
+                f"Network Latest Block: {latest_block_rpc1}\n"
+                f"{sync_rates}"
+            )
+            return message, True
+
+    except Exception as e:
+        logger.error(f"Error in compare_block_heights: {e}")
+        return f"❌ **Block Synchronization Error:** {e}", False
+
+def format_node_status(status_data: dict) -> str:
+    node_info = status_data.get('result', {}).get('node_info', {})
+    sync_info = status_data.get('result', {}).get('sync_info', {})
+    validator_info = status_data.get('result', {}).get('validator_info', {})
+
+    message = "**Node Status:**\n"
+    message += f"• Node ID: `{node_info.get('id', 'N/A')}`\n"
+    message += f"• Listen Address: `{node_info.get('listen_addr', 'N/A')}`\n"
+    message += f"• Network: `{node_info.get('network', 'N/A')}`\n"
+    message += f"• Version: `{node_info.get('version', 'N/A')}`\n\n"
+
+    message += "**Synchronization Info:**\n"
+    message += f"• Latest Block Height: `{sync_info.get('latest_block_height', 'N/A')}`\n"
+    message += f"• Latest Block Time: `{sync_info.get('latest_block_time', 'N/A')}`\n"
+    message += f"• Catching Up: `{sync_info.get('catching_up', False)}`\n\n"
+
+    message += "**Validator Info:**\n"
+    message += f"• Address: `{validator_info.get('address', 'N/A')}`\n"
+    message += f"• Voting Power: `{validator_info.get('voting_power', 'N/A')}`\n"
+    message += f"• Proposer Priority: `{validator_info.get('proposer_priority', 'N/A')}`\n\n"
+    return message
+
+
+@instrumented
+async def check_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    try:
+        service_states, status_data = await asyncio.gather(
+            get_service_states(),
+            get_node_status(),
+        )
+
+
+        block_message, is_synced = await compare_block_heights()
+
+
+        message = "📊 **Node Status:**\n\n"
+        message += f"**System Services:**\n"
+        message += format_service_states(service_states) + "\n"
+        message += format_node_status(status_data)
+        if EXECUTION_MONITORING:
+            message += "**Execution Layer:**\n" + execution_sampler.format() + "\n"
+        message += block_message
+
+        keyboard = [
+            [InlineKeyboardButton("Back to Main Menu", callback_data="start")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+
+
+        if len(message) <= 4096:
+            await update.callback_query.edit_message_text(
+                message, reply_markup=reply_markup, parse_mode='Markdown'
+            )
+        else:
+            outbound.send(update.effective_chat.id, message, OutboundQueue.INTERACTIVE, 'Markdown', reply_markup)
+
+        await update.callback_query.answer()
+    except Exception as e:
+        await update.callback_query.message.reply_text(f"❌ Error fetching status: {str(e)}")
+        await update.callback_query.answer()
+
+def load_fleet_config(path: str) -> List[dict]:
+    # A JSON list of {"label": ..., "rpc": "http://host:26657"} entries,
+    # optionally wrapped as {"nodes": [...]}.
+    if not path:
+        return []
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not load fleet config {path}: {e}")
+        return []
+
+    nodes = []
+    for node in data.get("nodes", []) if isinstance(data, dict) else data:
+        rpc = (node.get("rpc") or "").rstrip("/")
+        if not rpc:
+            logger.warning(f"Skipping fleet node without an rpc URL: {node}")
+            continue
+        nodes.append({"label": node.get("label") or rpc, "rpc": rpc})
+    return nodes
+
+
+FLEET_NODES = load_fleet_config(FLEET_CONFIG)
+
+
+async def poll_fleet_node(node: dict, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        started = time.monotonic()
+        try:
+            status, net_info = await asyncio.wait_for(asyncio.gather(
+                rpc_client.get_json(f"{node['rpc']}/status"),
+                rpc_client.get_json(f"{node['rpc']}/net_info"),
+            ), FLEET_TIMEOUT)
+        except Exception as e:
+            return {**node, "error": str(e) or type(e).__name__, "latency": time.monotonic() - started}
+
+    sync_info = safe_get(status, 'result', 'sync_info', default={})
+    return {
+        **node,
+        "status": status,
+        "height": int(sync_info.get('latest_block_height') or 0),
+        "catching_up": bool(sync_info.get('catching_up')),
+        "peers": int(safe_get(net_info, 'result', 'n_peers', default=0)),
+        "voting_power": safe_get(status, 'result', 'validator_info', 'voting_power', default="0"),
+        "latency": time.monotonic() - started,
+    }
+
+
+async def fetch_fleet() -> dict:
+    # Every node is polled concurrently (bounded by FLEET_CONCURRENCY) with its
+    # own timeout, so a sweep takes about as long as the slowest node.
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(FLEET_CONCURRENCY)
+    reference, *nodes = await asyncio.gather(
+        get_reference_height(),
+        *(poll_fleet_node(node, semaphore) for node in FLEET_NODES),
+        return_exceptions=True,
+    )
+    if isinstance(reference, BaseException):
+        reference = max((n["height"] for n in nodes if "error" not in n), default=None)
+    for node in nodes:
+        node["lag"] = reference - node["height"] if reference is not None and "error" not in node else None
+    return {"nodes": nodes, "reference_height": reference, "elapsed": time.monotonic() - started}
+
+
+async def get_fleet() -> dict:
+    return await snapshots.get("fleet", fetch_fleet)
+
+
+def format_fleet_summary(fleet: dict) -> str:
+    message = ""
+    for node in fleet["nodes"]:
+        if "error" in node:
+            message += f"❌ `{node['label']}`: {node['error']}\n"
+            continue
+        icon = "⏳" if node["catching_up"] else "⚠️" if (node["lag"] or 0) > FLEET_LAG_WARN else "✅"
+        message += (
+            f"{icon} `{node['label']}` h `{node['height']}` lag `{node['lag'] if node['lag'] is not None else 'N/A'}` "
+            f"peers `{node['peers']}` vp `{node['voting_power']}`\n"
+        )
+    return message
 
-async def send_monitoring_update(context: ContextTypes.DEFAULT_TYPE) -> None:
-    chat_id = context.job.chat_id
-    if not context.chat_data.get('monitoring', False):
-        return  
 
+@instrumented
+async def fleet_overview(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     try:
+        fleet = await get_fleet()
+        healthy = sum(1 for n in fleet["nodes"] if "error" not in n)
 
-        story_status = subprocess.check_output(["systemctl", "is-active", STORY_SERVICE]).decode().strip()
-        story_geth_status = subprocess.check_output(["systemctl", "is-active", STORY_GETH_SERVICE]).decode().strip()
+        message = "🛰 **Fleet Status:**\n\n"
+        message += f"Reference Height: `{fleet['reference_height'] or 'N/A'}`\n"
+        message += f"Reachable: `{healthy}/{len(fleet['nodes'])}` (sweep {fleet['elapsed']:.2f}s)\n\n"
+        message += format_fleet_summary(fleet)
 
+        buttons = [InlineKeyboardButton(node["label"], callback_data=f"fleet_{index}") for index, node in enumerate(FLEET_NODES)]
+        keyboard = [buttons[i:i + 3] for i in range(0, len(buttons), 3)]
+        keyboard.append([InlineKeyboardButton("🔄 Refresh", callback_data="fleet")])
+        keyboard.append([InlineKeyboardButton("Back to Main Menu", callback_data="start")])
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-        disk = psutil.disk_usage('/')
-        message = "🔍 **Disk Monitoring:**\n\n"
-        message += f"• **Total:** {disk.total / (1024 ** 3):.2f} GB\n"
-        message += f"• **Used:** {disk.used / (1024 ** 3):.2f} GB ({disk.percent}%)\n"
-        message += f"• **Free:** {disk.free / (1024 ** 3):.2f} GB\n\n"
+        if len(message) <= 4096:
+            await update.callback_query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+        else:
+            outbound.send(update.effective_chat.id, message, OutboundQueue.INTERACTIVE, 'Markdown', reply_markup)
+    except Exception as e:
+        logger.error(f"Error in fleet_overview: {e}")
+        await update.callback_query.edit_message_text(f"❌ Error fetching fleet status: {str(e)}")
 
 
-        block_message, is_synced = await compare_block_heights()
-        message += block_message
+@instrumented
+async def fleet_node_view(update: Update, context: ContextTypes.DEFAULT_TYPE, index: int) -> None:
+    try:
+        fleet = await get_fleet()
+        node = fleet["nodes"][index]
 
+        message = f"🛰 **{node['label']}** (`{node['rpc']}`)\n\n"
+        if "error" in node:
+            message += f"❌ Unreachable: {node['error']}\n"
+        else:
+            message += format_node_status(node["status"])
+            message += f"• Peers: `{node['peers']}`\n"
+            message += f"• Lag: `{node['lag'] if node['lag'] is not None else 'N/A'}` blocks\n"
+            message += f"• RPC Latency: `{node['latency'] * 1000:.0f} ms`\n"
 
         keyboard = [
+            [InlineKeyboardButton("⬅️ Back to Fleet", callback_data="fleet")],
             [InlineKeyboardButton("Back to Main Menu", callback_data="start")]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
+        await update.callback_query.edit_message_text(message, reply_markup=reply_markup, parse_mode='Markdown')
+    except Exception as e:
+        logger.error(f"Error in fleet_node_view: {e}")
+        await update.callback_query.edit_message_text(f"❌ Error fetching node status: {str(e)}")
 
 
-        if len(message) <= 4096:
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=message,
-                reply_markup=reply_markup,
-                parse_mode='Markdown'
+def format_bytes(value: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+def format_rate(value: float) -> str:
+    return f"{format_bytes(value)}/s"
+
+
+def format_percent(value: float) -> str:
+    return f"{value:.1f}%"
+
+
+class MetricsSampler:
+    # Samples host metrics every METRICS_SAMPLE_INTERVAL seconds into ring
+    # buffers, so the views can show averages and rates instead of a single
+    # point-in-time reading.
+    SERIES = ("cpu", "cpu_user", "cpu_system", "cpu_iowait", "memory", "swap", "load1", "disk_read", "disk_write",
+              "disk_used")
+
+    def __init__(self, interval: float, history_seconds: int):
+        self.interval = interval
+        capacity = int(history_seconds / interval)
+        self.series = {name: RingSeries(capacity) for name in self.SERIES}
+        self._last_disk = None
+
+    def _sample(self) -> None:
+        now = time.time()
+        cpu = psutil.cpu_times_percent(interval=None)
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        load1 = psutil.getloadavg()[0]
+        disk = psutil.disk_io_counters()
+
+        self.series["cpu"].append(now, 100.0 - cpu.idle)
+        self.series["cpu_user"].append(now, cpu.user)
+        self.series["cpu_system"].append(now, cpu.system)
+        self.series["cpu_iowait"].append(now, getattr(cpu, "iowait", 0.0))
+        self.series["memory"].append(now, memory.percent)
+        self.series["swap"].append(now, swap.percent)
+        self.series["load1"].append(now, load1)
+        if disk is not None:
+            if self._last_disk is not None:
+                elapsed = now - self._last_disk[0]
+                if elapsed > 0:
+                    self.series["disk_read"].append(now, max(0, disk.read_bytes - self._last_disk[1]) / elapsed)
+                    self.series["disk_write"].append(now, max(0, disk.write_bytes - self._last_disk[2]) / elapsed)
+            self._last_disk = (now, disk.read_bytes, disk.write_bytes)
+        self.series["disk_used"].append(now, psutil.disk_usage('/').percent)
+
+    async def run(self) -> None:
+        # The first cpu_times_percent() call only primes psutil's counters.
+        await asyncio.to_thread(psutil.cpu_times_percent, None)
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self._sample)
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {e}")
+
+    def dump(self) -> dict:
+        return {name: series.dump() for name, series in self.series.items()}
+
+    def restore(self, data: dict) -> None:
+        for name, saved in data.items():
+            if name in self.series:
+                self.series[name].restore(saved)
+
+    def summary(self, name: str, fmt) -> str:
+        series = self.series[name]
+        if not len(series):
+            return "collecting..."
+        parts = [f"now {fmt(series.latest())}"]
+        for label, seconds in (("1m", 60), ("15m", 900), ("1h", 3600)):
+            parts.append(f"{label} {fmt(series.average(seconds))}")
+        parts.append(f"p95 {fmt(series.percentile(3600, 95))}")
+        return " | ".join(parts)
+
+
+metrics_sampler = MetricsSampler(METRICS_SAMPLE_INTERVAL, METRICS_HISTORY_SECONDS)
+
+
+class NetworkSampler:
+    # Keeps the previous per-interface counters so the views show throughput,
+    # packet, error and drop rates instead of totals since boot.
+    FIELDS = ("bytes_sent", "bytes_recv", "packets_sent", "packets_recv", "errin", "errout", "dropin", "dropout")
+
+    def __init__(self, interval: float, history_seconds: int):
+        self.interval = interval
+        capacity = int(history_seconds / interval)
+        self.series = {"sent": RingSeries(capacity), "recv": RingSeries(capacity)}
+        self.rates = {}
+        self.totals = {}
+        self._last = None
+
+    def _sample(self) -> None:
+        now = time.time()
+        counters = {nic: c._asdict() for nic, c in psutil.net_io_counters(pernic=True).items()}
+        if self._last is not None and now > self._last[0]:
+            elapsed = now - self._last[0]
+            rates = {}
+            for nic, current in counters.items():
+                previous = self._last[1].get(nic)
+                if previous is not None:
+                    # Counters can reset when an interface is re-created.
+                    rates[nic] = {f: max(0, current[f] - previous[f]) / elapsed for f in self.FIELDS}
+            self.rates = rates
+            external = [r for nic, r in rates.items() if nic != "lo"]
+            self.series["sent"].append(now, sum(r["bytes_sent"] for r in external))
+            self.series["recv"].append(now, sum(r["bytes_recv"] for r in external))
+        self._last = (now, counters)
+        self.totals = counters
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self._sample)
+            except Exception as e:
+                logger.error(f"Error sampling network counters: {e}")
+            await asyncio.sleep(self.interval)
+
+    def dump(self) -> dict:
+        return {name: series.dump() for name, series in self.series.items()}
+
+    def restore(self, data: dict) -> None:
+        for name, saved in data.items():
+            if name in self.series:
+                self.series[name].restore(saved)
+
+    def format(self) -> str:
+        if not self.rates:
+            return "Throughput: collecting...\n"
+        message = (
+            f"Throughput (excluding lo):\n"
+            f"  Sent: {summarize_rate(self.series['sent'])}\n"
+            f"  Received: {summarize_rate(self.series['recv'])}\n\n"
+        )
+        message += "Per Interface (now):\n"
+        for nic, r in sorted(self.rates.items()):
+            message += (
+                f"  {nic}: ↑ {format_rate(r['bytes_sent'])} ↓ {format_rate(r['bytes_recv'])}, "
+                f"{r['packets_sent'] + r['packets_recv']:.0f} pkt/s"
             )
+            errors = r['errin'] + r['errout']
+            drops = r['dropin'] + r['dropout']
+            if errors or drops:
+                message += f", ⚠️ {errors:.1f} err/s, {drops:.1f} drop/s"
+            message += "\n"
+        return message
+
+
+def summarize_rate(series: RingSeries) -> str:
+    if not len(series):
+        return "collecting..."
+    return (
+        f"now {format_rate(series.latest())} | 1m {format_rate(series.average(60))} | "
+        f"15m {format_rate(series.average(900))} | p95 1h {format_rate(series.percentile(3600, 95))}"
+    )
+
+
+network_sampler = NetworkSampler(METRICS_SAMPLE_INTERVAL, METRICS_HISTORY_SECONDS)
+
+
+def classify_connections(connections) -> dict:
+    # Established sockets on one of the process's own listening ports are
+    # inbound, everything else established is outbound. Loopback peers (RPC
+    # clients such as this bot) are counted apart from P2P traffic.
+    listening = {c.laddr.port for c in connections if c.status == psutil.CONN_LISTEN}
+    breakdown = {"listening": sorted(listening), "inbound": {}, "outbound": 0, "local": 0, "other": 0}
+    for c in connections:
+        if c.status == psutil.CONN_LISTEN:
+            continue
+        if c.status != psutil.CONN_ESTABLISHED or not c.raddr:
+            breakdown["other"] += 1
+        elif c.raddr.ip.startswith("127.") or c.raddr.ip in ("::1", "::ffff:127.0.0.1"):
+            breakdown["local"] += 1
+        elif c.laddr.port in listening:
+            breakdown["inbound"][c.laddr.port] = breakdown["inbound"].get(c.laddr.port, 0) + 1
         else:
-            messages = split_message(message)
-            for idx, msg in enumerate(messages):
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=msg,
-                    reply_markup=reply_markup if idx == 0 else None,
-                    parse_mode='Markdown'
+            breakdown["outbound"] += 1
+    return breakdown
+
+
+class ProcessSampler:
+    # Per-service resource history for the units' MainPIDs. psutil.Process
+    # handles are kept between samples (cpu_percent needs the previous call's
+    # counters) and only rebuilt when systemd reports a different PID.
+    SERIES = ("cpu", "rss", "fds", "threads", "io_read", "io_write", "sockets")
+    PID_TTL = 60
+
+    def __init__(self, interval: float, history_seconds: int):
+        self.interval = interval
+        self.capacity = int(history_seconds / interval)
+        self.handles = {}
+        self.series = {}
+        self.connections = {}
+        self.connections_at = None
+        self._last_io = {}
+
+    def _series(self, service: str) -> dict:
+        if service not in self.series:
+            self.series[service] = {name: RingSeries(self.capacity) for name in self.SERIES}
+        return self.series[service]
+
+    async def _resolve(self) -> None:
+        services = await snapshots.get("services", fetch_service_states, self.PID_TTL)
+        for service, state in services.items():
+            pid = state["main_pid"]
+            handle = self.handles.get(service)
+            if handle is not None and handle.pid == pid:
+                continue
+            self._last_io.pop(service, None)
+            if not pid:
+                self.handles.pop(service, None)
+                continue
+            try:
+                handle = psutil.Process(pid)
+                handle.cpu_percent(None)
+                self.handles[service] = handle
+                logger.info(f"Tracking {service} as PID {pid}")
+            except psutil.Error as e:
+                self.handles.pop(service, None)
+                logger.warning(f"Cannot track {service} PID {pid}: {e}")
+
+    def _sample(self) -> List[str]:
+        now = time.time()
+        gone = []
+        # The socket scan is the expensive part, so it runs on its own, slower cadence.
+        scan = self.connections_at is None or now - self.connections_at >= NET_CONNECTIONS_INTERVAL
+        for service, handle in list(self.handles.items()):
+            series = self._series(service)
+            try:
+                with handle.oneshot():
+                    cpu = handle.cpu_percent(None)
+                    rss = handle.memory_info().rss
+                    threads = handle.num_threads()
+                    fds = handle.num_fds()
+                    try:
+                        io = handle.io_counters()
+                    except (psutil.AccessDenied, AttributeError):
+                        io = None
+                connections = handle.net_connections(kind="inet") if scan else None
+            except psutil.NoSuchProcess:
+                gone.append(service)
+                continue
+            except psutil.AccessDenied as e:
+                logger.warning(f"Access denied sampling {service}: {e}")
+                continue
+            series["cpu"].append(now, cpu)
+            series["rss"].append(now, rss)
+            series["threads"].append(now, threads)
+            series["fds"].append(now, fds)
+            if connections is not None:
+                series["sockets"].append(now, len(connections))
+                self.connections[service] = classify_connections(connections)
+            if io is not None:
+                last = self._last_io.get(service)
+                if last is not None and now > last[0]:
+                    series["io_read"].append(now, max(0, io.read_bytes - last[1]) / (now - last[0]))
+                    series["io_write"].append(now, max(0, io.write_bytes - last[2]) / (now - last[0]))
+                self._last_io[service] = (now, io.read_bytes, io.write_bytes)
+        if scan:
+            self.connections_at = now
+            for service in set(self.connections) - set(self.handles):
+                del self.connections[service]
+        return gone
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self._resolve()
+                gone = await asyncio.to_thread(self._sample)
+                if gone:
+                    # Restarted between samples: pick up the new MainPID right away.
+                    for service in gone:
+                        self.handles.pop(service, None)
+                    snapshots.invalidate("services")
+            except Exception as e:
+                logger.error(f"Error sampling service processes: {e}")
+            await asyncio.sleep(self.interval)
+
+    def dump(self) -> dict:
+        return {service: {name: s.dump() for name, s in series.items()} for service, series in self.series.items()}
+
+    def restore(self, data: dict) -> None:
+        # PIDs are not restored: _resolve() looks them up again on the first sample.
+        for service, saved in data.items():
+            if service not in (STORY_SERVICE, STORY_GETH_SERVICE):
+                continue
+            series = self._series(service)
+            for name, points in saved.items():
+                if name in series:
+                    series[name].restore(points)
+
+    def rss_growth(self, service: str) -> float:
+        # Bytes per hour over PROCESS_TREND_WINDOW, once at least half of it is covered.
+        series = self.series.get(service, {}).get("rss")
+        if series is None or not len(series):
+            return None
+        points = series.points(PROCESS_TREND_WINDOW)
+        if points[-1][0] - points[0][0] < PROCESS_TREND_WINDOW / 2:
+            return None
+        slope = series.slope(PROCESS_TREND_WINDOW)
+        return None if slope is None else slope * 3600
+
+    def format_connections(self) -> str:
+        if self.connections_at is None:
+            return "Service Connections: collecting...\n"
+        message = f"Service Connections (scanned {format_duration(time.time() - self.connections_at)} ago):\n"
+        for service, breakdown in self.connections.items():
+            inbound = breakdown["inbound"]
+            by_port = ", ".join(f"{port}: {count}" for port, count in sorted(inbound.items()))
+            message += (
+                f"  {service}:\n"
+                f"    P2P In: {sum(inbound.values())}{f' ({by_port})' if by_port else ''}\n"
+                f"    P2P Out: {breakdown['outbound']}\n"
+                f"    Local: {breakdown['local']}, Other States: {breakdown['other']}\n"
+                f"    Listening: {', '.join(str(p) for p in breakdown['listening']) or 'none'}\n"
+            )
+        return message
+
+    def format(self) -> str:
+        if not self.series:
+            return ""
+        message = "Service Processes:\n"
+        for service, series in self.series.items():
+            if not len(series["rss"]):
+                continue
+            handle = self.handles.get(service)
+            message += f"  {service} (PID {handle.pid if handle else 'gone'}):\n"
+            message += f"    CPU: {summarize_series(series['cpu'], format_percent)}\n"
+            message += f"    RSS: {summarize_series(series['rss'], format_bytes)}\n"
+            growth = self.rss_growth(service)
+            if growth is not None:
+                flag = " ⚠️" if growth >= ALERT_RSS_GROWTH_MB_HOUR * 1024 ** 2 else ""
+                message += f"    RSS Trend: {'+' if growth >= 0 else '-'}{format_bytes(abs(growth))}/h{flag}\n"
+            fd_slope = series["fds"].slope(PROCESS_TREND_WINDOW)
+            message += f"    FDs: {series['fds'].latest():.0f}"
+            message += f" ({fd_slope * 3600:+.0f}/h)\n" if fd_slope is not None else "\n"
+            message += f"    Threads: {series['threads'].latest():.0f}"
+            message += f", Sockets: {series['sockets'].latest():.0f}\n" if len(series["sockets"]) else "\n"
+            if len(series["io_read"]):
+                message += (
+                    f"    Disk I/O: read {format_rate(series['io_read'].average(60))}, "
+                    f"write {format_rate(series['io_write'].average(60))}\n"
                 )
+        return message
+
+
+def summarize_series(series: RingSeries, fmt) -> str:
+    return f"now {fmt(series.latest())} | 15m {fmt(series.average(900))} | max 1h {fmt(max(series.window(3600), default=series.latest()))}"
+
+
+process_sampler = ProcessSampler(PROCESS_SAMPLE_INTERVAL, METRICS_HISTORY_SECONDS)
+
+
+class ExecutionClient:
+    # JSON-RPC to story-geth. geth.ipc is preferred: one unix socket kept open
+    # between samples, without HTTP framing or a TCP stack. When the socket is
+    # missing or fails, the HTTP endpoint is used and the socket retried later.
+    IPC_RETRY = 60
+    IPC_LIMIT = 4 * 1024 * 1024
+
+    def __init__(self, ipc_path: str, http_url: str):
+        self.ipc_path = ipc_path
+        self.http_url = http_url
+        self.transport = None
+        self._reader = None
+        self._writer = None
+        self._ipc_failed_at = None
+        self._lock = asyncio.Lock()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    def _use_ipc(self) -> bool:
+        if not self.ipc_path or not os.path.exists(self.ipc_path):
+            return False
+        return self._ipc_failed_at is None or time.monotonic() - self._ipc_failed_at >= self.IPC_RETRY
+
+    async def _ipc(self, payload: list) -> list:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(self.ipc_path, limit=self.IPC_LIMIT), RPC_CONNECT_TIMEOUT
+            )
+        try:
+            with latency.timed("rpc geth.ipc (batch)"):
+                self._writer.write(json.dumps(payload).encode() + b"\n")
+                await self._writer.drain()
+                # geth writes each response as one JSON document followed by a newline.
+                line = await asyncio.wait_for(self._reader.readline(), RPC_READ_TIMEOUT)
+        except BaseException:
+            # A half-read response would be mistaken for the next one.
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise ConnectionError("geth.ipc closed the connection")
+        return json.loads(line)
+
+    async def batch(self, calls: List[Tuple[str, list]]) -> dict:
+        # Returns {method: result}; methods that returned an error are left out.
+        payload = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+                   for i, (method, params) in enumerate(calls)]
+        async with self._lock:
+            responses = None
+            if self._use_ipc():
+                try:
+                    responses = await self._ipc(payload)
+                    self.transport = "ipc"
+                    self._ipc_failed_at = None
+                except (OSError, ValueError, asyncio.TimeoutError) as e:
+                    logger.warning(f"geth.ipc at {self.ipc_path} failed, using {self.http_url}: {e}")
+                    self._ipc_failed_at = time.monotonic()
+            if responses is None:
+                responses = await rpc_client.post_json(self.http_url, payload)
+                self.transport = "http"
+        if not isinstance(responses, list):
+            raise Exception(f"Unexpected batch response: {str(responses)[:200]}")
+        results = {}
+        for response in responses:
+            index = response.get("id") if isinstance(response, dict) else None
+            if isinstance(index, int) and 0 <= index < len(calls) and "result" in response:
+                results[calls[index][0]] = response["result"]
+        return results
+
+
+EXECUTION_CALLS = [("eth_blockNumber", []), ("eth_syncing", []), ("net_peerCount", []),
+                   ("txpool_status", []), ("eth_gasPrice", [])]
+
+
+class ExecutionSampler:
+    # story-geth state from one batched round-trip per EL_SAMPLE_INTERVAL. The
+    # consensus - execution height gap is recorded whenever a new consensus
+    # height sample arrives, so the two heights are at most one interval apart.
+    SERIES = ("height", "peers", "pending", "queued", "gas_price", "gap")
+
+    def __init__(self, client: ExecutionClient, interval: float, history_seconds: int):
+        self.client = client
+        self.interval = interval
+        capacity = int(history_seconds / interval)
+        self.series = {name: RingSeries(capacity) for name in self.SERIES}
+        self.syncing = None
+        self.error = None
+        self.sampled_at = None
+        self.round_trip = None
+        self.last_advance = None
+        self._gap_at = None
+
+    async def sample(self) -> None:
+        started = time.monotonic()
+        results = await self.client.batch(EXECUTION_CALLS)
+        if "eth_blockNumber" not in results:
+            raise Exception("eth_blockNumber failed")
+        self.round_trip = time.monotonic() - started
+        now = time.time()
+
+        height = int(results["eth_blockNumber"], 16)
+        previous = self.series["height"].latest()
+        if self.last_advance is None or previous is None or height > previous:
+            self.last_advance = now
+        self.series["height"].append(now, height)
+        if "net_peerCount" in results:
+            self.series["peers"].append(now, int(results["net_peerCount"], 16))
+        txpool = results.get("txpool_status")
+        if isinstance(txpool, dict):
+            self.series["pending"].append(now, int(txpool.get("pending") or "0x0", 16))
+            self.series["queued"].append(now, int(txpool.get("queued") or "0x0", 16))
+        if "eth_gasPrice" in results:
+            self.series["gas_price"].append(now, int(results["eth_gasPrice"], 16))
+        syncing = results.get("eth_syncing")
+        self.syncing = syncing if isinstance(syncing, dict) or syncing is False else None
+
+        consensus_at = height_tracker.node.latest_time()
+        if consensus_at is not None and consensus_at != self._gap_at:
+            self._gap_at = consensus_at
+            self.series["gap"].append(now, height_tracker.node.latest() - height)
+        self.sampled_at = now
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.sample()
+                if self.error is not None:
+                    logger.info("story-geth RPC is answering again")
+                    self.error = None
+            except Exception as e:
+                if self.error is None:
+                    logger.warning(f"Error sampling story-geth: {e}")
+                self.error = str(e) or type(e).__name__
+            await asyncio.sleep(self.interval)
+
+    def stalled_for(self) -> float:
+        return None if self.last_advance is None else time.time() - self.last_advance
+
+    def divergence(self) -> float:
+        # How much the consensus - execution gap grew over HEIGHT_RATE_WINDOW:
+        # near 0 while both layers advance together, rising when geth falls behind.
+        gaps = self.series["gap"].window(HEIGHT_RATE_WINDOW)
+        if len(gaps) < 2:
+            return None
+        return gaps[-1] - min(gaps)
+
+    def dump(self) -> dict:
+        return {"series": {name: series.dump() for name, series in self.series.items()},
+                "last_advance": self.last_advance}
+
+    def restore(self, data: dict) -> None:
+        for name, saved in data["series"].items():
+            if name in self.series:
+                self.series[name].restore(saved)
+        self.last_advance = data["last_advance"]
+
+    def format(self) -> str:
+        if self.sampled_at is None:
+            return f"• Not available: {self.error}\n" if self.error else "• collecting...\n"
+        latest = lambda name: self.series[name].latest() if len(self.series[name]) else None
+        message = (
+            f"• Block Height: `{latest('height'):.0f}` "
+            f"(advanced {format_duration(self.stalled_for())} ago)\n"
+        )
+        if isinstance(self.syncing, dict):
+            current = int(self.syncing.get("currentBlock") or "0x0", 16)
+            highest = int(self.syncing.get("highestBlock") or "0x0", 16)
+            message += f"• Syncing: `Yes`, {current}/{highest} ({highest - current} behind)\n"
+        elif self.syncing is False:
+            message += "• Syncing: `No`\n"
+        gap, divergence = latest("gap"), self.divergence()
+        if gap is not None:
+            message += f"• Consensus - Execution Gap: `{gap:.0f}` blocks"
+            message += f" (`{divergence:+.0f}` over {format_duration(HEIGHT_RATE_WINDOW)})\n" if divergence is not None else "\n"
+        if latest("peers") is not None:
+            message += f"• Peers: `{latest('peers'):.0f}`\n"
+        if latest("pending") is not None:
+            message += f"• Txpool: `{latest('pending'):.0f}` pending, `{latest('queued'):.0f}` queued\n"
+        if latest("gas_price") is not None:
+            message += f"• Gas Price: `{latest('gas_price') / 1e9:.2f}` gwei\n"
+        message += (
+            f"• Sampled via `{self.client.transport}` in `{self.round_trip * 1000:.0f} ms`, "
+            f"{format_duration(time.time() - self.sampled_at)} ago\n"
+        )
+        if self.error is not None:
+            message += f"• ⚠️ Last sample failed: {self.error}\n"
+        return message
+
+
+EXECUTION_MONITORING = bool(STORY_GETH_SERVICE)
+execution_client = ExecutionClient(GETH_IPC_PATH, GETH_RPC_URL)
+execution_sampler = ExecutionSampler(execution_client, EL_SAMPLE_INTERVAL, METRICS_HISTORY_SECONDS)
+
+
+class DataDirIndex:
+    # Incrementally maintained size of one directory tree. A directory is only
+    # re-listed when its mtime changes (an entry was added, removed or renamed).
+    # Appends do not touch the directory, so files written within HOT_SECONDS
+    # are re-stat'd on every refresh while older ones (finished SST files,
+    # sealed freezer segments) are folded into a per-directory total. A full
+    # walk every FULL_RESCAN picks up a quiet file that starts growing again.
+    HOT_SECONDS = 3600
+    FULL_RESCAN = 6 * 3600
+
+    def __init__(self, root: str):
+        self.root = root
+        self.dirs = {}
+        self.children = {}
+        self.total = None
+        self.full_at = None
+
+    def _list(self, path: str, now_ns: int) -> list:
+        cold, hot, subdirs = 0, {}, []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                # Allocated blocks, as du counts them, so sparse files are not overstated.
+                if now_ns - st.st_mtime_ns < self.HOT_SECONDS * 1e9:
+                    hot[entry.name] = st.st_blocks * 512
+                else:
+                    cold += st.st_blocks * 512
+        return [cold, hot, subdirs]
+
+    def _size(self, path: str, full: bool, now_ns: int, stats: dict, visited: set, children: dict = None) -> int:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            cached = self.dirs.get(path)
+            relist = full or cached is None or cached[0] != mtime
+            if relist:
+                cached = self.dirs[path] = [mtime, *self._list(path, now_ns)]
+                stats["listed"] += 1
+        except (FileNotFoundError, PermissionError):
+            # Removed mid-walk, or not ours to read: counted as empty.
+            return 0
+        visited.add(path)
+        if not relist:
+            hot = cached[2]
+            for name in list(hot):
+                try:
+                    st = os.stat(os.path.join(path, name))
+                except FileNotFoundError:
+                    del hot[name]
+                    continue
+                stats["stat"] += 1
+                if now_ns - st.st_mtime_ns >= self.HOT_SECONDS * 1e9:
+                    cached[1] += st.st_blocks * 512
+                    del hot[name]
+                else:
+                    hot[name] = st.st_blocks * 512
+        total = cached[1] + sum(cached[2].values())
+        for name in cached[3]:
+            size = self._size(os.path.join(path, name), full, now_ns, stats, visited)
+            if children is not None:
+                children[name] = size
+            total += size
+        return total
+
+    def refresh(self) -> dict:
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(f"{self.root} is not a directory")
+        started = time.monotonic()
+        now = time.time()
+        full = self.full_at is None or now - self.full_at >= self.FULL_RESCAN
+        stats, visited, children = {"listed": 0, "stat": 0, "full": full}, set(), {}
+        self.total = self._size(self.root, full, int(now * 1e9), stats, visited, children)
+        self.children = children
+        if full:
+            self.full_at = now
+        # Directories that were removed since the last refresh.
+        for path in self.dirs.keys() - visited:
+            del self.dirs[path]
+        stats["elapsed"] = time.monotonic() - started
+        return stats
+
+
+def find_mountpoint(path: str) -> str:
+    path = os.path.realpath(path)
+    while not os.path.ismount(path):
+        path = os.path.dirname(path)
+    return path
+
+
+class DiskTracker:
+    # Data directory sizes and usage of the filesystems holding them, sampled
+    # every DISK_SCAN_INTERVAL into ring buffers. Growth and the "full in"
+    # forecast are least-squares slopes over DISK_FORECAST_WINDOW.
+    MIN_SPAN = 3600
+
+    def __init__(self, dirs: dict, interval: float, history_seconds: int):
+        self.interval = interval
+        self.capacity = int(history_seconds / interval)
+        self.indexes = {label: DataDirIndex(path) for label, path in dirs.items() if path}
+        self.sizes = {label: RingSeries(self.capacity) for label in self.indexes}
+        self.mounts = {}
+        self.used = {}
+        self.usage = {}
+        self.refreshes = {}
+        self.errors = {}
+
+    def _sample(self) -> None:
+        now = time.time()
+        for label, index in self.indexes.items():
+            try:
+                self.refreshes[label] = index.refresh()
+            except OSError as e:
+                if label not in self.errors:
+                    logger.warning(f"Cannot size {label} data directory: {e}")
+                self.errors[label] = str(e)
+                continue
+            self.errors.pop(label, None)
+            self.sizes[label].append(now, index.total)
+            if label not in self.mounts:
+                self.mounts[label] = find_mountpoint(index.root)
+                self.used.setdefault(self.mounts[label], RingSeries(self.capacity))
+        for mount, series in self.used.items():
+            usage = psutil.disk_usage(mount)
+            self.usage[mount] = usage
+            series.append(now, usage.used)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self._sample)
+            except Exception as e:
+                logger.error(f"Error sampling data directories: {e}")
+            await asyncio.sleep(self.interval)
+
+    def _per_day(self, series: RingSeries) -> float:
+        points = series.points(DISK_FORECAST_WINDOW)
+        if not points or points[-1][0] - points[0][0] < min(self.MIN_SPAN, DISK_FORECAST_WINDOW / 2):
+            return None
+        slope = series.slope(DISK_FORECAST_WINDOW)
+        return None if slope is None else slope * 86400
+
+    def growth(self, label: str) -> float:
+        return self._per_day(self.sizes[label])
+
+    def full_in(self, mount: str) -> float:
+        # Seconds until the filesystem is full at the current growth; inf when it is not growing.
+        per_day = self._per_day(self.used[mount])
+        usage = self.usage.get(mount)
+        if per_day is None or usage is None:
+            return None
+        return usage.free / per_day * 86400 if per_day > 0 else float("inf")
+
+    def soonest_full(self) -> float:
+        forecasts = [f for f in (self.full_in(mount) for mount in self.used) if f is not None]
+        return min(forecasts, default=None)
+
+    def dump(self) -> dict:
+        return {
+            "sizes": {label: series.dump() for label, series in self.sizes.items()},
+            "used": {mount: series.dump() for mount, series in self.used.items()},
+        }
+
+    def restore(self, data: dict) -> None:
+        for label, saved in data["sizes"].items():
+            if label in self.sizes:
+                self.sizes[label].restore(saved)
+        for mount, saved in data["used"].items():
+            self.used.setdefault(mount, RingSeries(self.capacity)).restore(saved)
+
+    def format(self) -> str:
+        if not self.indexes:
+            return ""
+        gb_day = lambda value: "collecting..." if value is None else f"{'+' if value >= 0 else '-'}{format_bytes(abs(value))}/day"
+        message = "Data Directories:\n"
+        for label, index in self.indexes.items():
+            if label in self.errors or index.total is None:
+                message += f"  {label}: {self.errors.get(label, 'collecting...')}\n"
+                continue
+            message += f"  {label} ({index.root}): {format_bytes(index.total)}, {gb_day(self.growth(label))}\n"
+            largest = sorted(index.children.items(), key=lambda item: item[1], reverse=True)[:3]
+            if largest:
+                message += "    Largest: " + ", ".join(f"{name} {format_bytes(size)}" for name, size in largest) + "\n"
+        for mount, usage in self.usage.items():
+            full_in = self.full_in(mount)
+            if full_in is None:
+                forecast = "forecast after 1h of history"
+            elif full_in == float("inf"):
+                forecast = "not growing"
+            else:
+                forecast = f"{'⚠️ ' if full_in < ALERT_DISK_FULL_DAYS * 86400 else ''}full in {format_duration(full_in)}"
+            message += (
+                f"Filesystem {mount}: {usage.percent}% used, {format_bytes(usage.free)} free, "
+                f"{gb_day(self._per_day(self.used[mount]))}, {forecast}\n"
+            )
+        if self.refreshes:
+            elapsed = sum(r["elapsed"] for r in self.refreshes.values())
+            listed = sum(r["listed"] for r in self.refreshes.values())
+            stat = sum(r["stat"] for r in self.refreshes.values())
+            message += f"Size Index: refreshed in {elapsed * 1000:.0f} ms ({listed} dirs listed, {stat} files re-checked)\n"
+        return message
+
+
+disk_tracker = DiskTracker(
+    {STORY_SERVICE or "story": STORY_DATA_DIR, STORY_GETH_SERVICE or "story-geth": GETH_DATA_DIR},
+    DISK_SCAN_INTERVAL, DISK_HISTORY_SECONDS
+)
+
+
+@instrumented
+async def system_info(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    try:
+        disk = psutil.disk_usage('/')
 
+        message = "💻 System Information:\n\n"
+        message += f"CPU Usage: {metrics_sampler.summary('cpu', format_percent)}\n"
+        message += f"Memory Usage: {metrics_sampler.summary('memory', format_percent)}\n"
+        message += f"Load (1m): {metrics_sampler.summary('load1', lambda v: f'{v:.2f}')}\n"
+        message += f"Disk Usage: {disk.percent}%\n"
+        data_dirs = disk_tracker.format()
+        if data_dirs:
+            message += f"\n{data_dirs}"
+
+        keyboard = [[InlineKeyboardButton("Back to Main Menu", callback_data="start")]]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        await update.callback_query.edit_message_text(message, reply_markup=reply_markup)
     except Exception as e:
-        error_message = f"Error in monitoring update: {str(e)}"
-        logger.error(error_message)
-        await context.bot.send_message(chat_id=chat_id, text=f"❌ {error_message}")
+        await update.callback_query.edit_message_text(f"❌ Error fetching system information: {str(e)}")
+
+MONITORING_SECTIONS = {
+    "services": "Services",
+    "disk": "Disk",
+    "sync": "Block Sync",
+    "system": "System",
+    "execution": "Execution Layer",
+    "fleet": "Fleet",
+}
+# Rendered from state the background samplers already keep, without a collection step.
+LOCAL_SECTIONS = {"system", "execution"}
+
+
+async def collect_monitoring_state(sections: set) -> dict:
+    # Runs once per monitoring tick, however many chats are subscribed.
+    tasks = {}
+    if "services" in sections:
+        tasks["services"] = get_service_states()
+    if "sync" in sections:
+        tasks["sync"] = compare_block_heights()
+    if "fleet" in sections and FLEET_NODES:
+        tasks["fleet"] = get_fleet()
+    if "disk" in sections:
+        tasks["disk"] = asyncio.to_thread(psutil.disk_usage, '/')
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    state = dict(zip(tasks, results))
+    state["collected_at"] = time.time()
+    return state
+
+
+def render_monitoring_report(state: dict, sections: set) -> str:
+    parts = []
+    for section in MONITORING_SECTIONS:
+        if section not in sections or (section not in state and section not in LOCAL_SECTIONS):
+            continue
+        value = state.get(section)
+        if isinstance(value, BaseException):
+            parts.append(f"❌ **{MONITORING_SECTIONS[section]}:** {value}")
+        elif section == "services":
+            parts.append("🔍 **Service Status:**\n\n" + format_service_states(value))
+        elif section == "disk":
+            parts.append(
+                "🔍 **Disk Monitoring:**\n\n"
+                f"• **Total:** {value.total / (1024 ** 3):.2f} GB\n"
+                f"• **Used:** {value.used / (1024 ** 3):.2f} GB ({value.percent}%)\n"
+                f"• **Free:** {value.free / (1024 ** 3):.2f} GB\n"
+            )
+            if disk_tracker.indexes:
+                parts[-1] += "\n" + disk_tracker.format()
+        elif section == "sync":
+            parts.append(value[0])
+        elif section == "system":
+            parts.append(
+                "💻 **System:**\n\n"
+                f"• CPU: {metrics_sampler.summary('cpu', format_percent)}\n"
+                f"• Memory: {metrics_sampler.summary('memory', format_percent)}\n"
+            )
+        elif section == "execution" and EXECUTION_MONITORING:
+            parts.append("⛓ **Execution Layer:**\n\n" + execution_sampler.format())
+        elif section == "fleet":
+            parts.append("🛰 **Fleet:**\n\n" + format_fleet_summary(value))
+    return "\n\n".join(parts)
+
+
+class MonitoringHub:
+    # One collection loop for every subscribed chat. Each tick gathers the
+    # sections needed by the chats that are due and fans the result out to them.
+    def __init__(self):
+        self.subscribers = {}
+        self._wakeup = asyncio.Event()
+
+    def get(self, chat_id: int) -> dict:
+        return self.subscribers.get(chat_id)
+
+    def subscribe(self, chat_id: int, interval: int = MONITORING_INTERVAL, sections: set = None) -> dict:
+        subscription = {
+            "interval": interval,
+            "sections": set(sections if sections is not None else MONITORING_SECTIONS),
+            "digest": MONITORING_DIGEST,
+            "next_due": time.monotonic() + MONITORING_TICK,
+        }
+        self.subscribers[chat_id] = subscription
+        self._wakeup.set()
+        state_store.save_soon()
+        return subscription
+
+    def unsubscribe(self, chat_id: int) -> None:
+        self.subscribers.pop(chat_id, None)
+        self._wakeup.set()
+        state_store.save_soon()
+
+    def set_interval(self, chat_id: int, interval: int) -> None:
+        subscription = self.subscribers[chat_id]
+        subscription["interval"] = interval
+        subscription["next_due"] = min(subscription["next_due"], time.monotonic() + interval)
+        self._wakeup.set()
+        state_store.save_soon()
+
+    def toggle_section(self, chat_id: int, section: str) -> None:
+        self.subscribers[chat_id]["sections"] ^= {section}
+        state_store.save_soon()
+
+    def toggle_digest(self, chat_id: int) -> bool:
+        subscription = self.subscribers[chat_id]
+        subscription["digest"] = not subscription["digest"]
+        self._wakeup.set()
+        state_store.save_soon()
+        return subscription["digest"]
+
+    def dump(self) -> list:
+        # next_due is on the monotonic clock, which does not survive a reboot,
+        # so it is saved as wall-clock time.
+        offset = time.time() - time.monotonic()
+        return [
+            {
+                "chat_id": chat_id,
+                "interval": sub["interval"],
+                "sections": sorted(sub["sections"]),
+                "digest": sub["digest"],
+                "next_due_at": sub["next_due"] + offset,
+            }
+            for chat_id, sub in self.subscribers.items()
+        ]
+
+    def restore(self, data: list) -> None:
+        offset = time.time() - time.monotonic()
+        for saved in data:
+            subscription = self.subscribe(saved["chat_id"], saved["interval"],
+                                          set(saved["sections"]) & set(MONITORING_SECTIONS))
+            subscription["digest"] = saved["digest"]
+            # A report that fell due while the bot was down goes out on the first tick.
+            subscription["next_due"] = max(time.monotonic(), saved["next_due_at"] - offset)
+
+    def broadcast(self, message: str) -> None:
+        for chat_id in list(self.subscribers):
+            outbound.send(chat_id, message, OutboundQueue.ALERT, 'Markdown')
+
+    def _send(self, chat_id: int, message: str) -> None:
+        keyboard = [[InlineKeyboardButton("Back to Main Menu", callback_data="start")]]
+        outbound.send(chat_id, message, OutboundQueue.REPORT, 'Markdown', InlineKeyboardMarkup(keyboard))
+
+    async def tick(self) -> None:
+        # Chats due within the next tick are served from the same collection.
+        now = time.monotonic()
+        due = [chat_id for chat_id, sub in self.subscribers.items()
+               if sub["digest"] and sub["next_due"] <= now + MONITORING_TICK]
+        if not due:
+            return
+        sections = set().union(*(self.subscribers[chat_id]["sections"] for chat_id in due))
+        state = await collect_monitoring_state(sections)
+        for chat_id in due:
+            subscription = self.subscribers.get(chat_id)
+            if subscription is None:
+                continue
+            subscription["next_due"] = now + subscription["interval"]
+            report = render_monitoring_report(state, subscription["sections"])
+            if report:
+                self._send(chat_id, report)
+
+    async def run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Error in monitoring loop: {e}")
+            next_due = min((sub["next_due"] for sub in self.subscribers.values() if sub["digest"]), default=None)
+            await wait_event(self._wakeup, None if next_due is None else max(1.0, next_due - time.monotonic()))
+
+
+monitoring_hub = MonitoringHub()
+
+
+class AlertRule:
+    def __init__(self, name: str, title: str, fire, clear, for_count: int = 1, fmt=str):
+        self.name = name
+        self.title = title
+        self.fire = fire
+        self.clear = clear
+        self.for_count = for_count
+        self.fmt = fmt
+        self.firing = False
+        self.pending = 0
+        self.value = None
+        self.fired_at = None
+        self.notified = False
+        self.last_notified = 0.0
+
+
+class AlertEngine:
+    # Rules only produce a message when they change state. `fire`/`clear` are
+    # separate thresholds (hysteresis), `for_count` consecutive observations are
+    # needed to flip, and a rule that re-fires within the cooldown stays quiet.
+    PERSISTED = ("firing", "pending", "value", "fired_at", "notified", "last_notified")
+
+    def __init__(self, cooldown: float):
+        self.cooldown = cooldown
+        self.rules = {}
+
+    def add(self, rule: AlertRule) -> None:
+        self.rules.setdefault(rule.name, rule)
+
+    def firing(self) -> List[AlertRule]:
+        return [rule for rule in self.rules.values() if rule.firing]
+
+    def observe(self, name: str, value) -> str:
+        rule = self.rules.get(name)
+        if rule is None or value is None:
+            return None
+        rule.value = value
+        flipping = rule.clear(value) if rule.firing else rule.fire(value)
+        if not flipping:
+            rule.pending = 0
+            return None
+        rule.pending += 1
+        if rule.pending < rule.for_count:
+            return None
+        rule.pending = 0
+        now = time.time()
+
+        if not rule.firing:
+            rule.firing = True
+            rule.fired_at = now
+            rule.notified = now - rule.last_notified >= self.cooldown
+            if rule.notified:
+                rule.last_notified = now
+                return f"🚨 **{rule.title}:** {rule.fmt(value)}"
+            return None
+
+        rule.firing = False
+        if rule.notified:
+            return f"✅ **Resolved: {rule.title}** after {format_duration(now - rule.fired_at)} ({rule.fmt(value)})"
+        return None
+
+    def dispatch(self, messages: List[str]) -> None:
+        messages = [m for m in messages if m]
+        if messages:
+            monitoring_hub.broadcast("\n".join(messages))
+
+    def dump(self) -> dict:
+        return {name: {field: getattr(rule, field) for field in self.PERSISTED} for name, rule in self.rules.items()}
+
+    def restore(self, data: dict) -> None:
+        # A rule still firing across a restart neither alerts again nor loses its resolution message.
+        for name, saved in data.items():
+            rule = self.rules.get(name)
+            if rule is not None:
+                for field in self.PERSISTED:
+                    setattr(rule, field, saved[field])
+
+
+alert_engine = AlertEngine(ALERT_COOLDOWN)
+
+
+def build_alert_rules() -> None:
+    stall_limit = BLOCK_DEADLINE if MONITOR_MODE == "websocket" else HEIGHT_STALL_SECONDS
+    for service in (STORY_SERVICE, STORY_GETH_SERVICE):
+        if service:
+            alert_engine.add(AlertRule(
+                f"service:{service}", f"{service} service not active",
+                fire=lambda state: state != "active", clear=lambda state: state == "active",
+                for_count=2, fmt=lambda state: f"state `{state}`"
+            ))
+    alert_engine.add(AlertRule(
+        "lag", "Node is behind the network",
+        fire=lambda lag: lag > ALERT_LAG_BLOCKS, clear=lambda lag: lag <= ALERT_LAG_BLOCKS // 2,
+        for_count=2, fmt=lambda lag: f"{lag} blocks behind"
+    ))
+    alert_engine.add(AlertRule(
+        "stall", "Block height stalled",
+        fire=lambda silent: silent > stall_limit, clear=lambda silent: silent <= stall_limit,
+        fmt=lambda silent: f"no new block for {format_duration(silent)}" if silent else "new block received"
+    ))
+    alert_engine.add(AlertRule(
+        "catching_up", "Node is catching up",
+        fire=lambda catching_up: catching_up, clear=lambda catching_up: not catching_up,
+        for_count=2, fmt=lambda catching_up: f"catching_up `{catching_up}`"
+    ))
+    alert_engine.add(AlertRule(
+        "missed_streak", "Validator missing blocks",
+        fire=lambda streak: streak >= ALERT_MISSED_STREAK, clear=lambda streak: streak == 0,
+        fmt=lambda streak: f"{streak} blocks missed in a row" if streak else "signing again"
+    ))
+    alert_engine.add(AlertRule(
+        "disk", "Disk almost full",
+        fire=lambda percent: percent >= ALERT_DISK_PERCENT, clear=lambda percent: percent < ALERT_DISK_PERCENT - 5,
+        fmt=lambda percent: f"{percent:.1f}% used"
+    ))
+    alert_engine.add(AlertRule(
+        "disk_forecast", "Disk filling up",
+        fire=lambda seconds: seconds < ALERT_DISK_FULL_DAYS * 86400,
+        clear=lambda seconds: seconds >= ALERT_DISK_FULL_DAYS * 1.5 * 86400,
+        for_count=2, fmt=lambda seconds: "not growing" if seconds == float("inf") else f"full in {format_duration(seconds)}"
+    ))
+    alert_engine.add(AlertRule(
+        "peers", "Low peer count",
+        fire=lambda peers: peers < ALERT_MIN_PEERS, clear=lambda peers: peers >= ALERT_MIN_PEERS + 2,
+        for_count=2, fmt=lambda peers: f"{peers} peers"
+    ))
+    for service in (STORY_SERVICE, STORY_GETH_SERVICE):
+        if service:
+            alert_engine.add(AlertRule(
+                f"rss_growth:{service}", f"{service} memory keeps growing",
+                fire=lambda growth: growth >= ALERT_RSS_GROWTH_MB_HOUR * 1024 ** 2,
+                clear=lambda growth: growth < ALERT_RSS_GROWTH_MB_HOUR * 1024 ** 2 / 2,
+                for_count=3, fmt=lambda growth: f"RSS {'+' if growth >= 0 else '-'}{format_bytes(abs(growth))}/h"
+            ))
+    if EXECUTION_MONITORING:
+        alert_engine.add(AlertRule(
+            "el_stall", "story-geth height stalled",
+            fire=lambda silent: silent > HEIGHT_STALL_SECONDS, clear=lambda silent: silent <= HEIGHT_STALL_SECONDS,
+            for_count=2, fmt=lambda silent: f"no new execution block for {format_duration(silent)}"
+        ))
+        alert_engine.add(AlertRule(
+            "el_divergence", "story-geth falling behind consensus",
+            fire=lambda drift: drift > ALERT_EL_DIVERGENCE, clear=lambda drift: drift <= ALERT_EL_DIVERGENCE // 2,
+            for_count=2, fmt=lambda drift: f"consensus - execution gap grew by {drift:.0f} blocks"
+        ))
+        alert_engine.add(AlertRule(
+            "el_syncing", "story-geth is syncing",
+            fire=lambda syncing: syncing, clear=lambda syncing: not syncing,
+            for_count=2, fmt=lambda syncing: f"eth_syncing `{syncing}`"
+        ))
+    for node in FLEET_NODES:
+        alert_engine.add(AlertRule(
+            f"fleet:{node['label']}", f"Fleet node {node['label']} unhealthy",
+            fire=lambda lag: lag > ALERT_LAG_BLOCKS, clear=lambda lag: lag <= ALERT_LAG_BLOCKS // 2,
+            for_count=2, fmt=lambda lag: "unreachable" if lag == float("inf") else f"{lag} blocks behind"
+        ))
+
+
+async def collect_alert_state() -> dict:
+    # Any snapshot younger than ALERT_INTERVAL (e.g. from the height sampler or a
+    # Status click) is reused, so evaluating the rules costs at most one round
+    # of requests, shared by all rules.
+    tasks = {
+        "services": snapshots.get("services", fetch_service_states, ALERT_INTERVAL),
+        "status": snapshots.get("status", fetch_node_status, ALERT_INTERVAL),
+        "net_info": get_net_info(ALERT_INTERVAL),
+        "disk": asyncio.to_thread(psutil.disk_usage, '/'),
+    }
+    if FLEET_NODES:
+        tasks["fleet"] = snapshots.get("fleet", fetch_fleet, max(ALERT_INTERVAL, 60))
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    return {key: None if isinstance(value, BaseException) else value for key, value in zip(tasks, results)}
+
+
+def evaluate_alerts(state: dict) -> List[str]:
+    messages = []
+    services = state.get("services") or {}
+    for service, service_state in services.items():
+        messages.append(alert_engine.observe(f"service:{service}", service_state["active_state"]))
+    messages.append(alert_engine.observe("lag", height_tracker.lag()))
+    for service in process_sampler.series:
+        messages.append(alert_engine.observe(f"rss_growth:{service}", process_sampler.rss_growth(service)))
+    if MONITOR_MODE != "websocket":
+        messages.append(alert_engine.observe("stall", height_tracker.stalled_for()))
+    if EXECUTION_MONITORING:
+        messages.append(alert_engine.observe("el_stall", execution_sampler.stalled_for()))
+        messages.append(alert_engine.observe("el_divergence", execution_sampler.divergence()))
+        if execution_sampler.syncing is not None:
+            messages.append(alert_engine.observe("el_syncing", bool(execution_sampler.syncing)))
+    if state.get("status") is not None:
+        messages.append(alert_engine.observe("catching_up", bool(safe_get(state["status"], 'result', 'sync_info', 'catching_up', default=False))))
+    if state.get("net_info") is not None:
+        messages.append(alert_engine.observe("peers", int(safe_get(state["net_info"], 'result', 'n_peers', default=0))))
+    if state.get("disk") is not None:
+        messages.append(alert_engine.observe("disk", state["disk"].percent))
+    messages.append(alert_engine.observe("disk_forecast", disk_tracker.soonest_full()))
+    for node in (state.get("fleet") or {}).get("nodes", []):
+        lag = float("inf") if "error" in node else node["lag"]
+        messages.append(alert_engine.observe(f"fleet:{node['label']}", lag))
+    return messages
 
 
+async def run_alerts() -> None:
+    while True:
+        await asyncio.sleep(ALERT_INTERVAL)
+        try:
+            alert_engine.dispatch(evaluate_alerts(await collect_alert_state()))
+        except Exception as e:
+            logger.error(f"Error evaluating alerts: {e}")
+
+
+def prometheus_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusWriter:
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name: str, kind: str, help_text: str, samples) -> None:
+        # samples: a single value, or an iterable of (labels dict, value).
+        if not isinstance(samples, list):
+            samples = [({}, samples)]
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        self.lines.append(f"# HELP story_{name} {help_text}")
+        self.lines.append(f"# TYPE story_{name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{prometheus_label(val)}"' for key, val in labels.items())
+            value = float(value)
+            value = str(int(value)) if value.is_integer() else repr(value)
+            self.lines.append(f"story_{name}{{{label_text}}} {value}" if label_text else f"story_{name} {value}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def render_prometheus() -> str:
+    # Everything here comes from state the background loops already keep:
+    # a scrape never issues an RPC call, a systemctl call or a psutil poll.
+    out = PrometheusWriter()
+    latest = lambda series: series.latest() if len(series) else None
+
+    out.metric("node_height", "gauge", "Latest block height of the local node.", latest(height_tracker.node))
+    out.metric("network_height", "gauge", "Reference network block height.", latest(height_tracker.network))
+    out.metric("height_lag_blocks", "gauge", "Blocks the local node is behind the network.", height_tracker.lag())
+    out.metric("node_blocks_per_second", "gauge", "Local block rate over HEIGHT_RATE_WINDOW.", height_tracker.node_rate())
+    out.metric("network_blocks_per_second", "gauge", "Network block rate over HEIGHT_RATE_WINDOW.", height_tracker.network_rate())
+    out.metric("seconds_since_height_advance", "gauge", "Seconds since the local height last increased.", height_tracker.stalled_for())
+    if MONITOR_MODE == "websocket":
+        out.metric("block_stream_connected", "gauge", "Whether the block websocket is connected.", int(block_watcher.connected))
+
+    status = snapshots.peek("status")
+    if status is not None:
+        out.metric("catching_up", "gauge", "Whether the node reports catching_up.",
+                   int(bool(safe_get(status, 'result', 'sync_info', 'catching_up', default=False))))
+        out.metric("voting_power", "gauge", "Voting power of the local validator.",
+                   int(safe_get(status, 'result', 'validator_info', 'voting_power', default=0) or 0))
+    net_info = snapshots.peek("net_info")
+    if net_info is not None:
+        out.metric("peers", "gauge", "Connected peers.", int(safe_get(net_info, 'result', 'n_peers', default=0)))
+    if peer_tracker.sampled_at is not None:
+        outbound_peers = sum(1 for peer in peer_tracker.peers.values() if peer["outbound"])
+        out.metric("peers_by_direction", "gauge", "Connected peers by direction.",
+                   [({"direction": "out"}, outbound_peers), ({"direction": "in"}, len(peer_tracker.peers) - outbound_peers)])
+        out.metric("peers_joined_total", "counter", "Peers that joined since the bot started.", peer_tracker.joined_total)
+        out.metric("peers_left_total", "counter", "Peers that left since the bot started.", peer_tracker.left_total)
+        out.metric("peer_churn_per_hour", "gauge", "Peer joins plus leaves per hour over PEER_CHURN_WINDOW.",
+                   peer_tracker.churn()[2])
+
+    services = snapshots.peek("services") or {}
+    out.metric("service_active", "gauge", "Whether the systemd unit is active.",
+               [({"service": name}, int(state["active_state"] == "active")) for name, state in services.items()])
+    out.metric("service_restarts_total", "counter", "systemd restart count of the unit.",
+               [({"service": name}, state["restarts"]) for name, state in services.items()])
+    out.metric("service_uptime_seconds", "gauge", "Seconds since the unit entered the active state.",
+               [({"service": name}, state["uptime"]) for name, state in services.items()])
+
+    for name, help_text in (
+        ("cpu", "CPU usage percent."), ("cpu_iowait", "CPU I/O wait percent."), ("memory", "Memory usage percent."),
+        ("swap", "Swap usage percent."), ("load1", "1 minute load average."), ("disk_used", "Root filesystem usage percent."),
+        ("disk_read", "Disk read bytes per second."), ("disk_write", "Disk write bytes per second."),
+    ):
+        out.metric(f"host_{name}", "gauge", help_text, latest(metrics_sampler.series[name]))
+    for field, help_text in (
+        ("bytes_sent", "Bytes sent per second."), ("bytes_recv", "Bytes received per second."),
+        ("packets_sent", "Packets sent per second."), ("packets_recv", "Packets received per second."),
+        ("errin", "Receive errors per second."), ("errout", "Transmit errors per second."),
+        ("dropin", "Dropped incoming packets per second."), ("dropout", "Dropped outgoing packets per second."),
+    ):
+        out.metric(f"net_{field}_per_second", "gauge", help_text,
+                   [({"nic": nic}, rates[field]) for nic, rates in sorted(network_sampler.rates.items())])
+    out.metric("service_connections", "gauge", "Established inet connections of the service by direction.",
+               [({"service": service, "direction": direction}, value)
+                for service, b in process_sampler.connections.items()
+                for direction, value in (("in", sum(b["inbound"].values())), ("out", b["outbound"]), ("local", b["local"]))])
+
+    for name, help_text in (
+        ("cpu", "CPU percent of the service's main process."), ("rss", "Resident memory of the service's main process in bytes."),
+        ("fds", "Open file descriptors of the service's main process."), ("threads", "Threads of the service's main process."),
+        ("sockets", "Open inet sockets of the service's main process."),
+        ("io_read", "Disk read bytes per second of the service's main process."),
+        ("io_write", "Disk write bytes per second of the service's main process."),
+    ):
+        out.metric(f"process_{name}", "gauge", help_text,
+                   [({"service": service}, latest(series[name])) for service, series in process_sampler.series.items()])
+
+    if EXECUTION_MONITORING:
+        for name, help_text in (
+            ("height", "Latest story-geth block number."), ("peers", "story-geth peer count."),
+            ("pending", "Pending transactions in the story-geth txpool."),
+            ("queued", "Queued transactions in the story-geth txpool."),
+            ("gas_price", "story-geth suggested gas price in wei."),
+            ("gap", "Consensus height minus execution block number."),
+        ):
+            out.metric(f"el_{name}", "gauge", help_text, latest(execution_sampler.series[name]))
+        out.metric("el_syncing", "gauge", "Whether story-geth reports eth_syncing.",
+                   None if execution_sampler.syncing is None else int(bool(execution_sampler.syncing)))
+        out.metric("el_seconds_since_advance", "gauge", "Seconds since the story-geth block number last increased.",
+                   execution_sampler.stalled_for())
+
+    out.metric("data_dir_bytes", "gauge", "Size of the service's data directory.",
+               [({"dir": label}, index.total) for label, index in disk_tracker.indexes.items()])
+    out.metric("data_dir_growth_bytes_per_day", "gauge", "Data directory growth over DISK_FORECAST_WINDOW.",
+               [({"dir": label}, disk_tracker.growth(label)) for label in disk_tracker.indexes])
+    forecasts = [(mount, disk_tracker.full_in(mount)) for mount in disk_tracker.usage]
+    out.metric("filesystem_full_seconds", "gauge", "Seconds until the filesystem holding a data directory is full.",
+               [({"mount": mount}, seconds) for mount, seconds in forecasts if seconds != float("inf")])
+
+    if signing_tracker.recorded:
+        out.metric("signing_window_blocks", "gauge", "Blocks in the signing window.", signing_tracker.recorded)
+        out.metric("signing_missed_blocks", "gauge", "Missed blocks in the signing window.", signing_tracker.missed)
+        out.metric("signing_missed_streak", "gauge", "Current consecutive missed blocks.", signing_tracker.streak)
+        out.metric("signing_scanned_height", "gauge", "Last height checked by the signing tracker.", signing_tracker.last_height)
+    validator_set = validator_sets.current
+    if validator_set is not None:
+        out.metric("validator_set_size", "gauge", "Validators in the active set.", len(validator_set["validators"]))
+        out.metric("validator_set_power", "gauge", "Total voting power of the active set.", validator_set["total_power"])
+        address = (safe_get(status or {}, 'result', 'validator_info', 'address', default="") or "").upper()
+        out.metric("validator_rank", "gauge", "Rank of the local validator by voting power.", validator_set["index"].get(address))
+
+    fleet = snapshots.peek("fleet")
+    if fleet is not None:
+        nodes = fleet["nodes"]
+        out.metric("fleet_up", "gauge", "Whether the fleet node answered the last sweep.",
+                   [({"node": n["label"]}, int("error" not in n)) for n in nodes])
+        out.metric("fleet_height", "gauge", "Block height of the fleet node.",
+                   [({"node": n["label"]}, n.get("height")) for n in nodes])
+        out.metric("fleet_lag_blocks", "gauge", "Blocks the fleet node is behind the reference.",
+                   [({"node": n["label"]}, n.get("lag")) for n in nodes])
+
+    out.metric("alert_firing", "gauge", "Whether the alert rule is currently firing.",
+               [({"rule": rule.name}, int(rule.firing)) for rule in alert_engine.rules.values()])
+    out.metric("monitoring_subscribers", "gauge", "Chats subscribed to monitoring.", len(monitoring_hub.subscribers))
+    out.metric("outbound_pending", "gauge", "Telegram messages waiting in the outbound queue.",
+               sum(len(items) for items in outbound.pending.values()))
+    out.metric("outbound_messages_total", "counter", "Telegram messages handled by the outbound queue.",
+               [({"result": "sent"}, outbound.sent), ({"result": "merged"}, outbound.merged),
+                ({"result": "dropped"}, outbound.dropped), ({"result": "retried"}, outbound.retried)])
+    latency_histogram(out)
+    return out.render()
+
+
+def latency_histogram(out: PrometheusWriter) -> None:
+    if not latency.ops:
+        return
+    name = "story_operation_duration_seconds"
+    out.lines.append(f"# HELP {name} Latency of bot handlers, RPC calls, subprocesses and Telegram sends.")
+    out.lines.append(f"# TYPE {name} histogram")
+    for op_name, op in latency.ops.items():
+        label = f'op="{prometheus_label(op_name)}"'
+        cumulative = 0
+        for bound, count in zip(LatencyStats.BUCKETS, op["buckets"]):
+            cumulative += count
+            out.lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+        out.lines.append(f'{name}_bucket{{{label},le="+Inf"}} {op["count"]}')
+        out.lines.append(f"{name}_sum{{{label}}} {op['sum']!r}")
+        out.lines.append(f"{name}_count{{{label}}} {op['count']}")
+    out.metric("operation_errors_total", "counter", "Failed bot operations.",
+               [({"op": op_name}, op["errors"]) for op_name, op in latency.ops.items()])
+
+
+async def metrics_endpoint(request: web.Request) -> web.Response:
+    return web.Response(text=render_prometheus(), content_type="text/plain", charset="utf-8",
+                        headers={"Cache-Control": "no-store"})
+
+
+metrics_runner = None
+
+
+async def start_metrics_server() -> None:
+    global metrics_runner
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_endpoint)
+    metrics_runner = web.AppRunner(app, access_log=None)
+    await metrics_runner.setup()
+    await web.TCPSite(metrics_runner, METRICS_HOST, METRICS_PORT).start()
+    logger.info(f"Serving Prometheus metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
+
+@instrumented
 async def performance_metrics(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     try:
-        cpu_times = psutil.cpu_times_percent()
         memory = psutil.virtual_memory()
         swap = psutil.swap_memory()
-        disk_io = psutil.disk_io_counters()
         disk_usage = psutil.disk_usage('/')
         
         cpu_freq = psutil.cpu_freq()
@@ -549,13 +4042,16 @@ async def performance_metrics(update: Update, context: ContextTypes.DEFAULT_TYPE
 
         message = "📈 Detailed Performance Metrics:\n\n"
         message += f"CPU Usage:\n"
-        message += f"  User: {cpu_times.user}%\n"
-        message += f"  System: {cpu_times.system}%\n"
-        message += f"  Idle: {cpu_times.idle}%\n"
-        message += f"  Current Frequency: {cpu_freq.current:.2f} MHz\n"
+        message += f"  Total: {metrics_sampler.summary('cpu', format_percent)}\n"
+        message += f"  User: {metrics_sampler.summary('cpu_user', format_percent)}\n"
+        message += f"  System: {metrics_sampler.summary('cpu_system', format_percent)}\n"
+        message += f"  I/O Wait: {metrics_sampler.summary('cpu_iowait', format_percent)}\n"
+        if cpu_freq is not None:
+            message += f"  Current Frequency: {cpu_freq.current:.2f} MHz\n"
         message += f"  Load Average: {load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f}\n\n"
         
         message += f"Memory Usage:\n"
+        message += f"  History: {metrics_sampler.summary('memory', format_percent)}\n"
         message += f"  Total: {memory.total / (1024 ** 3):.2f} GB\n"
         message += f"  Available: {memory.available / (1024 ** 3):.2f} GB\n"
         message += f"  Used: {memory.used / (1024 ** 3):.2f} GB ({memory.percent}%)\n"
@@ -563,6 +4059,7 @@ async def performance_metrics(update: Update, context: ContextTypes.DEFAULT_TYPE
         message += f"  Cached: {memory.cached / (1024 ** 3):.2f} GB\n\n"
         
         message += f"Swap Usage:\n"
+        message += f"  History: {metrics_sampler.summary('swap', format_percent)}\n"
         message += f"  Total: {swap.total / (1024 ** 3):.2f} GB\n"
         message += f"  Used: {swap.used / (1024 ** 3):.2f} GB ({swap.percent}%)\n"
         message += f"  Free: {swap.free / (1024 ** 3):.2f} GB\n\n"
@@ -572,11 +4069,12 @@ async def performance_metrics(update: Update, context: ContextTypes.DEFAULT_TYPE
         message += f"  Used: {disk_usage.used / (1024 ** 3):.2f} GB ({disk_usage.percent}%)\n"
         message += f"  Free: {disk_usage.free / (1024 ** 3):.2f} GB\n\n"
         
-        message += f"Disk I/O (since boot):\n"
-        message += f"  Read: {disk_io.read_bytes / (1024 ** 3):.2f} GB\n"
-        message += f"  Write: {disk_io.write_bytes / (1024 ** 3):.2f} GB\n"
-        message += f"  Read Count: {disk_io.read_count}\n"
-        message += f"  Write Count: {disk_io.write_count}\n"
+        message += f"Disk I/O:\n"
+        message += f"  Read: {metrics_sampler.summary('disk_read', format_rate)}\n"
+        message += f"  Write: {metrics_sampler.summary('disk_write', format_rate)}\n"
+        processes = process_sampler.format()
+        if processes:
+            message += f"\n{processes}"
 
         keyboard = [[InlineKeyboardButton("Back to Main Menu", callback_data="start")]]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -584,25 +4082,21 @@ async def performance_metrics(update: Update, context: ContextTypes.DEFAULT_TYPE
     except Exception as e:
         await update.callback_query.edit_message_text(f"❌ Error fetching performance metrics: {str(e)}")
 
+@instrumented
 async def network_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     try:
-        net_io = psutil.net_io_counters()
-        net_connections = psutil.net_connections()
         net_if_addrs = psutil.net_if_addrs()
+        totals = network_sampler.totals
 
         message = "🌐 Detailed Network Statistics:\n\n"
-        message += f"Network I/O (since boot):\n"
-        message += f"  Bytes Sent: {net_io.bytes_sent / (1024 ** 3):.2f} GB\n"
-        message += f"  Bytes Received: {net_io.bytes_recv / (1024 ** 3):.2f} GB\n"
-        message += f"  Packets Sent: {net_io.packets_sent}\n"
-        message += f"  Packets Received: {net_io.packets_recv}\n"
-        message += f"  Errors In: {net_io.errin}\n"
-        message += f"  Errors Out: {net_io.errout}\n"
-        message += f"  Drop In: {net_io.dropin}\n"
-        message += f"  Drop Out: {net_io.dropout}\n\n"
-        
-        message += f"Active Connections: {len(net_connections)}\n\n"
-        
+        message += network_sampler.format() + "\n"
+        message += process_sampler.format_connections() + "\n"
+
+        if totals:
+            sent = sum(c["bytes_sent"] for nic, c in totals.items() if nic != "lo")
+            recv = sum(c["bytes_recv"] for nic, c in totals.items() if nic != "lo")
+            message += f"Since Boot: sent {format_bytes(sent)}, received {format_bytes(recv)}\n\n"
+
         message += "Network Interfaces:\n"
         for interface, addrs in net_if_addrs.items():
             message += f"  {interface}:\n"
@@ -618,15 +4112,34 @@ async def network_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     except Exception as e:
         await update.callback_query.edit_message_text(f"❌ Error fetching network statistics: {str(e)}")
 
+@instrumented
+async def peers_view(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    try:
+        message = peer_tracker.format()
+        keyboard = [
+            [InlineKeyboardButton("🔄 Refresh", callback_data="peers")],
+            [InlineKeyboardButton("Back to Main Menu", callback_data="start")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        if len(message) <= 4096:
+            await update.callback_query.edit_message_text(message, reply_markup=reply_markup)
+        else:
+            outbound.send(update.effective_chat.id, message, OutboundQueue.INTERACTIVE, None, reply_markup)
+    except BadRequest as e:
+        # Refresh with nothing new since the last sample.
+        if "not modified" not in str(e):
+            raise
+    except Exception as e:
+        await update.callback_query.edit_message_text(f"❌ Error fetching peers: {str(e)}")
+
+@instrumented
 async def validator_info(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     try:
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'http://localhost:{SERVER_PORT}/status') as resp:
-                status = await resp.json()
-            
-            async with session.get(f'http://localhost:{SERVER_PORT}/validators') as resp:
-                validators = await resp.json()
+        status, validator_set = await asyncio.gather(
+            get_node_status(),
+            validator_sets.latest(),
+        )
 
         node_info = status['result']['node_info']
         sync_info = status['result']['sync_info']
@@ -646,6 +4159,8 @@ async def validator_info(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         message += f"  Address: {validator_info.get('address', 'Not available')}\n"
         message += f"  Voting Power: {validator_info.get('voting_power', 'Not available')}\n"
         message += f"  Proposer Priority: {validator_info.get('proposer_priority', 'Not available')}\n\n"
+        message += format_validator_ranking(validator_set, validator_info.get('address'), validator_sets.changes) + "\n"
+        message += signing_tracker.format()
 
         keyboard = [[InlineKeyboardButton("Back to Main Menu", callback_data="start")]]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -654,6 +4169,39 @@ async def validator_info(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         logger.error(f"Error in validator_info: {e}")
         await update.callback_query.edit_message_text(f"❌ Error fetching validator information: {str(e)}")
 
+def format_latency_report(slowest: int = 10) -> str:
+    if not latency.ops:
+        return "⏱ No operations timed yet."
+    ms = lambda seconds: f"{seconds * 1000:.0f}ms" if seconds < 10 else f"{seconds:.1f}s"
+    message = f"⏱ Latency (last {LATENCY_SAMPLES} samples per operation)\n\n"
+    for kind in ("handler", "rpc", "exec", "telegram"):
+        names = sorted(name for name in latency.ops if name.split(" ", 1)[0] == kind)
+        if not names:
+            continue
+        message += f"{kind}:\n"
+        for name in names:
+            op = latency.ops[name]
+            p50, p95, p99 = latency.percentiles(name)
+            message += (
+                f"  {name.split(' ', 1)[1]}\n"
+                f"    n={op['count']} err={op['errors']} p50 {ms(p50)} p95 {ms(p95)} p99 {ms(p99)}\n"
+            )
+        message += "\n"
+    message += "🐢 Slowest recent:\n"
+    for ts, name, seconds, error in latency.slowest(slowest):
+        message += f"  {datetime.fromtimestamp(ts).strftime('%H:%M:%S')} {ms(seconds)} {name}{' ❌' if error else ''}\n"
+    return message
+
+
+@admin_only
+async def latency_report(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    message = format_latency_report()
+    if len(message) <= 4000:
+        await update.message.reply_text(message, disable_web_page_preview=True)
+    else:
+        outbound.send(update.effective_chat.id, message, OutboundQueue.INTERACTIVE)
+
+
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     logger.error(f"Error occurred: {context.error}")
     try:
@@ -663,17 +4211,86 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         logger.error(f"Error in error handler: {e}")
 
 
-def main() -> None:
-    application = Application.builder().token(BOT_TOKEN).build()
+def restore_state() -> None:
+    # Runs before the loops that own this state start, so restored history is
+    # never interleaved with fresh samples. Alert rules must already exist.
+    state_store.attach("subscriptions", monitoring_hub.restore, monitoring_hub.dump)
+    state_store.attach("alerts", alert_engine.restore, alert_engine.dump)
+    state_store.attach("signing", signing_tracker.restore, signing_tracker.dump)
+    state_store.attach("heights", height_tracker.restore, height_tracker.dump, history=True)
+    state_store.attach("metrics", metrics_sampler.restore, metrics_sampler.dump, history=True)
+    state_store.attach("network", network_sampler.restore, network_sampler.dump, history=True)
+    state_store.attach("processes", process_sampler.restore, process_sampler.dump, history=True)
+    state_store.attach("disk", disk_tracker.restore, disk_tracker.dump, history=True)
+    if EXECUTION_MONITORING:
+        state_store.attach("execution", execution_sampler.restore, execution_sampler.dump, history=True)
+    if monitoring_hub.subscribers:
+        logger.info(f"Resumed monitoring for {len(monitoring_hub.subscribers)} chat(s)")
+
+
+async def post_init(application: Application) -> None:
+    await rpc_client.start()
+    await state_store.open()
+    build_alert_rules()
+    restore_state()
+    start_background(state_store.run())
+    await start_journal_followers()
+    start_background(metrics_sampler.run())
+    start_background(process_sampler.run())
+    start_background(network_sampler.run())
+    start_background(sample_heights())
+    if EXECUTION_MONITORING:
+        start_background(execution_sampler.run())
+    if disk_tracker.indexes:
+        start_background(disk_tracker.run())
+    start_background(peer_tracker.run())
+    start_background(outbound.run(application.bot))
+    start_background(monitoring_hub.run())
+    start_background(run_alerts())
+    start_background(signing_tracker.run())
+    if METRICS_PORT:
+        await start_metrics_server()
+    if MONITOR_MODE == "websocket":
+        start_background(block_watcher.run())
+        start_background(block_watcher.watchdog())
+
+
+async def post_shutdown(application: Application) -> None:
+    if metrics_runner is not None:
+        await metrics_runner.cleanup()
+    await stop_background()
+    await state_store.close()
+    await log_store.close()
+    execution_client.close()
+    await rpc_client.close()
+
+
+def build_application(token: str = BOT_TOKEN, base_url: str = None) -> Application:
+    # Updates are handled concurrently, so a slow systemctl or RPC call in one
+    # chat's handler never holds up the others. Handlers share state only
+    # through the coalescing snapshot cache and the trackers, which are not
+    # modified across an await.
+    builder = (
+        Application.builder().token(token).post_init(post_init).post_shutdown(post_shutdown)
+        .concurrent_updates(CONCURRENT_UPDATES)
+    )
+    if base_url:
+        builder = builder.base_url(base_url)
+    application = builder.build()
 
     application.add_handler(CommandHandler("start", start))
+    application.add_handler(CommandHandler("search", search_logs))
+    application.add_handler(CommandHandler("latency", latency_report))
+    application.add_handler(CommandHandler("export", export_logs))
 
     application.add_error_handler(error_handler)
-    
 
     application.add_handler(CallbackQueryHandler(button_handler))
+    return application
 
-    
+
+def main() -> None:
+    application = build_application()
     application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 if __name__ == '__main__':